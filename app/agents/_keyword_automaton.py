@@ -0,0 +1,146 @@
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
+import ahocorasick
+
+# Keywords per agent and category, with each agent's categories in priority order
+KEYWORDS: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "greeter": {
+        "specialist": (
+            "content", "seo", "website", "product", "feature",
+            "email", "notification", "technical"
+        ),
+    },
+    "email": {
+        "spam": ("spam", "junk", "unwanted"),
+        "delivery": ("delivery", "receive", "sent"),
+        "settings": ("settings", "preference", "configure"),
+        "notifications": ("notification", "alert", "update"),
+        "escalation": (
+            "hack", "breach", "security", "compromised", "access",
+            "error", "broken", "technical", "bug", "system"
+        ),
+    },
+    "content": {
+        "landing_page": ("buy", "pricing", "features", "hero section"),
+        "blog_post": ("article", "post", "blog"),
+        "product_page": ("product", "specification", "details"),
+        "about_page": ("about", "team", "mission", "vision"),
+        "seo_content": ("seo", "keyword", "meta"),
+    },
+    "product": {
+        "website_builder": ("builder", "create", "design", "edit"),
+        "templates": ("template", "theme", "layout"),
+        "ecommerce": ("shop", "store", "ecommerce", "payment"),
+        "hosting": ("host", "domain", "ssl"),
+        "integrations": ("integrate", "plugin", "connect"),
+    },
+    "routing": {
+        "content": ("content", "page", "seo", "blog", "website"),
+        "email": ("email", "spam", "newsletter"),
+        "product": ("product", "item", "price", "stock"),
+    },
+}
+
+# Bit assigned to each category of an agent; lower bits take priority
+_CATEGORY_BITS: Dict[str, Dict[str, int]] = {
+    agent: {category: 1 << index for index, category in enumerate(categories)}
+    for agent, categories in KEYWORDS.items()
+}
+_CATEGORY_NAMES: Dict[str, Tuple[str, ...]] = {
+    agent: tuple(categories) for agent, categories in KEYWORDS.items()
+}
+
+def _build_automaton() -> ahocorasick.Automaton:
+    """Build one automaton mapping each keyword to its (agent, category bit) pairs."""
+    owners: Dict[str, list] = {}
+    for agent, categories in KEYWORDS.items():
+        for category, keywords in categories.items():
+            for keyword in keywords:
+                owners.setdefault(keyword, []).append((agent, _CATEGORY_BITS[agent][category]))
+                
+    automaton = ahocorasick.Automaton()
+    for keyword, pairs in owners.items():
+        automaton.add_word(keyword, tuple(pairs))
+    automaton.make_automaton()
+    return automaton
+
+_AUTOMATON = _build_automaton()
+
+# Longest text whose scan result is cached; longer texts are rare, cheap to
+# rescan relative to their size, and would otherwise be kept alive as cache keys
+_SCAN_CACHE_MAX_LENGTH = 4096
+
+def _scan(text_lower: str) -> Mapping[str, int]:
+    """Scan text once and build a bitmask of matched categories per agent."""
+    masks: Dict[str, int] = {}
+    for _, pairs in _AUTOMATON.iter(text_lower):
+        for agent, bit in pairs:
+            masks[agent] = masks.get(agent, 0) | bit
+    return MappingProxyType(masks)
+
+_cached_scan = lru_cache(maxsize=256)(_scan)
+
+def scan(text_lower: str) -> Mapping[str, int]:
+    """Scan text once and build a bitmask of matched categories per agent.
+    
+    The text is scanned once for all agents, and results for texts up to
+    _SCAN_CACHE_MAX_LENGTH characters are cached so the greeter and the
+    specialist it routes to can classify the same message without rescanning it.
+    
+    Args:
+        text_lower (str): Lowercased text to scan
+        
+    Returns:
+        Mapping[str, int]: Bitmask of matched categories, keyed by agent
+    """
+    if len(text_lower) > _SCAN_CACHE_MAX_LENGTH:
+        return _scan(text_lower)
+    return _cached_scan(text_lower)
+
+@lru_cache(maxsize=32)
+def _categories_mask(agent: str, categories: Tuple[str, ...]) -> int:
+    """Combine the bits of an agent's categories into a single mask."""
+    bits = _CATEGORY_BITS[agent]
+    mask = 0
+    for category in categories:
+        mask |= bits[category]
+    return mask
+
+def first_category(
+    text: str,
+    agent: str,
+    categories: Tuple[str, ...],
+    default: Optional[str] = None
+) -> Optional[str]:
+    """Get the highest-priority category of an agent matched by the text.
+    
+    Categories are prioritized in the order they are listed in KEYWORDS.
+    
+    Args:
+        text (str): The text to classify
+        agent (str): The agent whose categories to check
+        categories (Tuple[str, ...]): Categories to consider
+        default (Optional[str]): Category to return when nothing matches
+        
+    Returns:
+        Optional[str]: The first matching category
+    """
+    mask = scan(text.lower()).get(agent, 0) & _categories_mask(agent, categories)
+    if not mask:
+        return default
+    # Isolate the lowest set bit, i.e. the highest-priority category
+    return _CATEGORY_NAMES[agent][(mask & -mask).bit_length() - 1]
+
+def has_category(text: str, agent: str, category: str) -> bool:
+    """Check whether any keyword of an agent's category occurs in the text.
+    
+    Args:
+        text (str): The text to check
+        agent (str): The agent owning the category
+        category (str): The category to check
+        
+    Returns:
+        bool: True if the category matched
+    """
+    return bool(scan(text.lower()).get(agent, 0) & _CATEGORY_BITS[agent][category])
@@ -1,6 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict, deque
+from functools import lru_cache
+from itertools import islice
+from hashlib import blake2b
+from typing import AsyncIterator, ClassVar, Deque, List, Dict, Any, Optional, Set, Tuple
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
 from ..core.config import get_settings
 from ..core.exceptions import (
     GeminiError,
@@ -11,8 +16,12 @@ from ..core.exceptions import (
     ConfigurationError,
     handle_agent_error
 )
+from .semantic_cache import SemanticCache, SemanticCacheStore, context_key
+from ._keyword_automaton import first_category
+from .batcher import batcher
+import asyncio
+import random
 import time
-from tenacity import retry, stop_after_attempt, wait_exponential
 import logging
 
 # Configure logging
@@ -20,6 +29,17 @@ logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
+# Guidelines shared by every agent's context prompt
+_BASE_GUIDELINES = """Always maintain a professional and helpful tone.
+If you need to escalate to a human agent, clearly indicate this.
+Base your responses on the conversation history when relevant."""
+
+# Replies returned in place of a model response when processing fails
+_SAFETY_ERROR_RESPONSE = "I apologize, but I cannot provide a response to that query as it may contain inappropriate content. Please rephrase your request."
+_QUOTA_ERROR_RESPONSE = "I apologize, but we are experiencing high demand. Please try again in a moment."
+_UNAVAILABLE_ERROR_RESPONSE = "I apologize, but the service is temporarily unavailable. Please try again later."
+_GENERIC_ERROR_RESPONSE = "I apologize, but I'm having trouble processing your request. Please try again in a moment."
+
 # Configure the Gemini model
 try:
     genai.configure(api_key=settings.GOOGLE_API_KEY)
@@ -27,9 +47,118 @@ except Exception as e:
     logger.error(f"Failed to configure Gemini API: {str(e)}")
     raise ConfigurationError("Failed to initialize Gemini model", {"error": str(e)})
 
+# Model configuration shared by all agents
+_GENERATION_CONFIG = {
+    "temperature": 0.7,
+    "top_p": 0.8,
+    "top_k": 40,
+    "max_output_tokens": 1024,
+}
+
+_SAFETY_SETTINGS = [
+    {
+        "category": "HARM_CATEGORY_HARASSMENT",
+        "threshold": "BLOCK_MEDIUM_AND_ABOVE"
+    },
+    {
+        "category": "HARM_CATEGORY_HATE_SPEECH",
+        "threshold": "BLOCK_MEDIUM_AND_ABOVE"
+    },
+    {
+        "category": "HARM_CATEGORY_SEXUALLY_EXPLICIT",
+        "threshold": "BLOCK_MEDIUM_AND_ABOVE"
+    },
+    {
+        "category": "HARM_CATEGORY_DANGEROUS_CONTENT",
+        "threshold": "BLOCK_MEDIUM_AND_ABOVE"
+    },
+]
+
+@lru_cache(maxsize=8)
+def _get_model(model_name: str) -> genai.GenerativeModel:
+    """Get the shared Gemini model for a model name, creating it on first use.
+    
+    Args:
+        model_name (str): Name of the Gemini model
+        
+    Returns:
+        genai.GenerativeModel: Model configured with the shared settings
+    """
+    return genai.GenerativeModel(
+        model_name=model_name,
+        generation_config=_GENERATION_CONFIG,
+        safety_settings=_SAFETY_SETTINGS
+    )
+
+# Number of preceding turns that scope a semantic cache entry
+_SEMANTIC_CONTEXT_TURNS = 3
+
+# Retry policy for transient Gemini errors
+_MAX_ATTEMPTS = 3
+_MAX_RETRY_DELAY = 10.0
+_RETRYABLE_ERRORS = (GeminiQuotaError, GeminiUnavailableError)
+
+def _check_prompt_feedback(response: Any):
+    """Raise if Gemini blocked the prompt.
+    
+    Args:
+        response: A Gemini response or streamed response chunk
+        
+    Raises:
+        GeminiSafetyError: If the prompt was blocked
+    """
+    if response.prompt_feedback.block_reason:
+        error_msg = f"Content blocked by Gemini: {response.prompt_feedback.block_reason}"
+        logger.warning(error_msg)
+        raise GeminiSafetyError(error_msg, {
+            "block_reason": response.prompt_feedback.block_reason
+        })
+
+def _to_gemini_error(e: Exception) -> GeminiError:
+    """Translate an exception raised by the Gemini client.
+    
+    Args:
+        e (Exception): The exception raised by the client
+        
+    Returns:
+        GeminiError: The matching application error
+    """
+    if isinstance(e, GeminiError):
+        return e
+    if isinstance(e, genai.types.generation_types.BlockedPromptException):
+        return GeminiSafetyError("Content blocked by Gemini safety filters", {"error": str(e)})
+    if isinstance(e, google_exceptions.TooManyRequests):
+        return GeminiQuotaError("Gemini API quota exceeded", {"error": str(e)})
+    if isinstance(e, google_exceptions.BadRequest):
+        return GeminiInvalidRequestError("Invalid request to Gemini API", {"error": str(e)})
+    if isinstance(e, (
+        google_exceptions.ServiceUnavailable,
+        google_exceptions.DeadlineExceeded,
+        google_exceptions.InternalServerError
+    )):
+        return GeminiUnavailableError("Gemini API service unavailable", {"error": str(e)})
+    if isinstance(e, google_exceptions.GoogleAPICallError):
+        return GeminiError("Failed to generate content", {"error": str(e)})
+    logger.error(f"Unexpected error in Gemini content generation: {str(e)}")
+    return GeminiError("Unexpected error during content generation", {"error": str(e)})
+
 class BaseAgent(ABC):
     """Base class for all agents in the system."""
     
+    # Exact-match response cache shared by all agents, keyed by (agent class
+    # name, blake2b digest of context prompt + preceding user turns + message)
+    _response_cache: ClassVar["OrderedDict[Tuple[str, bytes], str]"] = OrderedDict()
+    response_cache_size: ClassVar[int] = 1024
+    cache_enabled: bool = True
+    # Semantic cache inserts between promotions to the long-term store
+    persist_interval: ClassVar[int] = settings.SEMANTIC_CACHE_PERSIST_INTERVAL
+    
+    # Keyword classification table: the KEYWORDS section to match against and
+    # its categories in priority order, with the category used when none match
+    _KEYWORD_AGENT: ClassVar[str] = ""
+    _CATEGORY_TABLE: ClassVar[Tuple[str, ...]] = ()
+    _DEFAULT_CATEGORY: ClassVar[Optional[str]] = None
+    
     def __init__(self, name: str, description: str):
         """Initialize the base agent.
         
@@ -45,44 +174,33 @@ class BaseAgent(ABC):
             self.name = name
             self.description = description
             
-            # Configure model with safety settings
-            generation_config = {
-                "temperature": 0.7,
-                "top_p": 0.8,
-                "top_k": 40,
-                "max_output_tokens": 1024,
-            }
-            
-            safety_settings = [
-                {
-                    "category": "HARM_CATEGORY_HARASSMENT",
-                    "threshold": "BLOCK_MEDIUM_AND_ABOVE"
-                },
-                {
-                    "category": "HARM_CATEGORY_HATE_SPEECH",
-                    "threshold": "BLOCK_MEDIUM_AND_ABOVE"
-                },
-                {
-                    "category": "HARM_CATEGORY_SEXUALLY_EXPLICIT",
-                    "threshold": "BLOCK_MEDIUM_AND_ABOVE"
-                },
-                {
-                    "category": "HARM_CATEGORY_DANGEROUS_CONTENT",
-                    "threshold": "BLOCK_MEDIUM_AND_ABOVE"
-                },
-            ]
-            
             try:
-                self.model = genai.GenerativeModel(
-                    model_name='gemini-pro',
-                    generation_config=generation_config,
-                    safety_settings=safety_settings
-                )
+                self.model = _get_model('gemini-pro')
             except Exception as e:
                 logger.error(f"Failed to initialize Gemini model: {str(e)}")
                 raise GeminiError("Failed to initialize Gemini model", {"error": str(e)})
                 
-            self.conversation_history: List[Dict[str, str]] = []
+            self.conversation_history: Deque[Dict[str, Any]] = deque(
+                maxlen=settings.MAX_HISTORY_TURNS
+            )
+            # History is stamped with the monotonic clock; these anchor it to
+            # wall-clock time when the history is read
+            self._wall_clock_base = time.time()
+            self._monotonic_base_ns = time.monotonic_ns()
+            
+            # Built once here; subclasses extend it after their own setup
+            self._context_prompt = "\n".join((f"You are {name}, {description}.", _BASE_GUIDELINES))
+            self._sem_cache = SemanticCache(
+                namespace=self.__class__.__name__,
+                store=(
+                    SemanticCacheStore(self.__class__.__name__)
+                    if settings.SEMANTIC_CACHE_PERSIST_ENABLED else None
+                )
+            )
+            if settings.SEMANTIC_CACHE_ENABLED:
+                self._sem_cache.preload()
+            self._sem_inserts = 0
+            self._background_tasks: Set[asyncio.Task] = set()
             
         except GeminiError:
             raise
@@ -101,28 +219,135 @@ class BaseAgent(ABC):
             self.conversation_history.append({
                 "role": role,
                 "content": content,
-                "timestamp": time.time()
+                "timestamp": time.monotonic_ns()
             })
         except Exception as e:
             logger.warning(f"Failed to add message to history: {str(e)}")
     
+    def _classify(self, message: str) -> Optional[str]:
+        """Classify a message against the agent's category table.
+        
+        Args:
+            message (str): The message to classify
+            
+        Returns:
+            Optional[str]: The highest-priority matching category, or the
+                agent's default category if none match
+        """
+        return first_category(
+            message,
+            self._KEYWORD_AGENT,
+            self._CATEGORY_TABLE,
+            default=self._DEFAULT_CATEGORY
+        )
+    
     def _get_context_prompt(self) -> str:
         """Get the context prompt for the agent.
         
         Returns:
             str: The context prompt describing the agent's role
         """
-        return f"""You are {self.name}, {self.description}. 
-        Always maintain a professional and helpful tone.
-        If you need to escalate to a human agent, clearly indicate this.
-        Base your responses on the conversation history when relevant."""
+        return self._context_prompt
+    
+    def _build_contents(self, message: str) -> List[Dict[str, Any]]:
+        """Build the model request for a user message.
+        
+        The static context prompt is sent as its own leading part so that the
+        request prefix is identical across messages and can be served from
+        the provider's prompt cache.
+        
+        Args:
+            message (str): The user message
+            
+        Returns:
+            List[Dict[str, Any]]: Request contents for the Gemini model
+        """
+        return [{
+            "role": "user",
+            "parts": [self._get_context_prompt(), f"User message: {message}"]
+        }]
+    
+    def _cache_key(self, context_prompt: str, context_key: str, message: str) -> Tuple[str, bytes]:
+        """Build the exact-match response cache key for a message.
+        
+        Args:
+            context_prompt (str): The agent's context prompt
+            context_key (str): Key of the user turns preceding the message
+            message (str): The user message
+            
+        Returns:
+            Tuple[str, bytes]: Agent class name and digest of prompt + context + message
+        """
+        digest = blake2b(
+            f"{context_prompt}\0{context_key}\0{message}".encode("utf-8"),
+            digest_size=16
+        ).digest()
+        return self.__class__.__name__, digest
+    
+    def _get_cached_response(self, key: Tuple[str, bytes]) -> Optional[str]:
+        """Look up a cached response and mark it as recently used.
+        
+        Args:
+            key (Tuple[str, bytes]): The cache key
+            
+        Returns:
+            Optional[str]: The cached response, or None on a miss
+        """
+        if not self.cache_enabled:
+            return None
+        response = self._response_cache.get(key)
+        if response is not None:
+            self._response_cache.move_to_end(key)
+        return response
+    
+    def _store_cached_response(self, key: Tuple[str, bytes], response: str):
+        """Store a response in the cache, evicting the least recently used entry.
+        
+        Args:
+            key (Tuple[str, bytes]): The cache key
+            response (str): The response to cache
+        """
+        if not self.cache_enabled:
+            return
+        self._response_cache[key] = response
+        self._response_cache.move_to_end(key)
+        if len(self._response_cache) > self.response_cache_size:
+            self._response_cache.popitem(last=False)
+    
+    def _preprocess(self, message: str) -> Optional[str]:
+        """Hook to answer a message without calling the model.
+        
+        Args:
+            message (str): The user message
+            
+        Returns:
+            Optional[str]: A direct response, or None to generate one
+        """
+        return None
+    
+    def _postprocess(self, response: str, message: str) -> str:
+        """Hook to adjust a generated response before it is returned.
+        
+        Streamed responses pass only their first chunk, so overrides should
+        only change the start of the response.
+        
+        Args:
+            response (str): The generated response
+            message (str): The user message
+            
+        Returns:
+            str: The response to return
+        """
+        return response
     
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
     async def _generate_response(self, message: str) -> str:
         """Generate a response based on the message with retry logic.
         
+        Quota and availability errors are retried with full-jitter exponential
+        backoff; other errors will not succeed on retry and are raised at once.
+        
         Args:
-            message (str): The message to process
+            message (str): The user message to respond to
             
         Returns:
             str: The generated response
@@ -133,34 +358,86 @@ class BaseAgent(ABC):
             GeminiInvalidRequestError: If the request is invalid
             GeminiUnavailableError: If the service is unavailable
         """
-        try:
-            response = await self.model.generate_content_async(
-                message,
-                stream=False
-            )
+        direct_response = self._preprocess(message)
+        if direct_response is not None:
+            return direct_response
             
-            if response.prompt_feedback.block_reason:
-                error_msg = f"Content blocked by Gemini: {response.prompt_feedback.block_reason}"
-                logger.warning(error_msg)
-                raise GeminiSafetyError(error_msg, {
-                    "block_reason": response.prompt_feedback.block_reason
-                })
+        for attempt in range(_MAX_ATTEMPTS):
+            try:
+                response = await batcher.submit(
+                    self.model,
+                    self._build_contents(message),
+                    stream=False
+                )
+                _check_prompt_feedback(response)
+                text = response.text if hasattr(response, 'text') else str(response)
+                return self._postprocess(text, message)
                 
-            return response.text if hasattr(response, 'text') else str(response)
-            
-        except genai.types.generation_types.BlockedPromptException as e:
-            raise GeminiSafetyError("Content blocked by Gemini safety filters", {"error": str(e)})
-        except genai.types.generation_types.GenerationException as e:
-            if "quota" in str(e).lower():
-                raise GeminiQuotaError("Gemini API quota exceeded", {"error": str(e)})
-            elif "invalid" in str(e).lower():
-                raise GeminiInvalidRequestError("Invalid request to Gemini API", {"error": str(e)})
-            elif "unavailable" in str(e).lower():
-                raise GeminiUnavailableError("Gemini API service unavailable", {"error": str(e)})
-            raise GeminiError("Failed to generate content", {"error": str(e)})
+            except Exception as e:
+                error = _to_gemini_error(e)
+                if not isinstance(error, _RETRYABLE_ERRORS) or attempt + 1 == _MAX_ATTEMPTS:
+                    raise error
+                    
+                delay = random.uniform(0, min(_MAX_RETRY_DELAY, 2 ** attempt))
+                logger.warning(
+                    f"Retrying Gemini request in {delay:.2f}s "
+                    f"(attempt {attempt + 1}/{_MAX_ATTEMPTS}): {str(error)}"
+                )
+                await asyncio.sleep(delay)
+    
+    async def _generate_response_stream(self, message: str) -> AsyncIterator[str]:
+        """Generate a response as a stream of text chunks.
+        
+        Streamed responses are not retried, since chunks may already have
+        been delivered to the caller.
+        
+        Args:
+            message (str): The user message to respond to
+            
+        Yields:
+            str: Chunks of the generated response
+            
+        Raises:
+            GeminiSafetyError: If content is blocked by safety filters
+            GeminiQuotaError: If API quota is exceeded
+            GeminiInvalidRequestError: If the request is invalid
+            GeminiUnavailableError: If the service is unavailable
+        """
+        direct_response = self._preprocess(message)
+        if direct_response is not None:
+            yield direct_response
+            return
+            
+        try:
+            response = await batcher.submit(
+                self.model,
+                self._build_contents(message),
+                stream=True
+            )
+            first_chunk = True
+            async for chunk in response:
+                _check_prompt_feedback(chunk)
+                if chunk.text:
+                    yield self._postprocess(chunk.text, message) if first_chunk else chunk.text
+                    first_chunk = False
+                    
         except Exception as e:
-            logger.error(f"Unexpected error in Gemini content generation: {str(e)}")
-            raise GeminiError("Unexpected error during content generation", {"error": str(e)})
+            raise _to_gemini_error(e)
+    
+    def _schedule_persist(self):
+        """Promote frequently hit semantic cache entries in the background."""
+        if self._sem_cache.store is None:
+            return
+        task = asyncio.create_task(self._persist_semantic_cache())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+    
+    async def _persist_semantic_cache(self):
+        """Write the most frequently hit semantic cache entries to the store."""
+        try:
+            await asyncio.to_thread(self._sem_cache.persist)
+        except Exception as e:
+            logger.warning(f"Failed to persist semantic cache for {self.name}: {str(e)}")
     
     async def process_message(self, message: str) -> str:
         """Process an incoming message and return a response.
@@ -175,49 +452,204 @@ class BaseAgent(ABC):
         self._add_to_history("user", message)
         
         try:
-            # Combine context prompt with user message
-            combined_message = f"{self._get_context_prompt()}\n\nUser message: {message}"
+            context = self._semantic_context()
+            cache_key = self._cache_key(self._get_context_prompt(), context[1], message)
+            use_semantic_cache = self._use_semantic_cache()
+            response = await self._lookup_cached_response(
+                message, cache_key, context, use_semantic_cache
+            )
             
-            # Get response from model
-            response = await self._generate_response(combined_message)
+            if response is None:
+                # Get response from model
+                response = await self._generate_response(message)
+                await self._cache_response(
+                    message, cache_key, context, response, use_semantic_cache
+                )
             
             # Add response to history
             self._add_to_history("assistant", response)
             
             return response
             
-        except GeminiSafetyError as e:
-            error_response = "I apologize, but I cannot provide a response to that query as it may contain inappropriate content. Please rephrase your request."
-            self._add_to_history("system", error_response)
-            return error_response
+        except Exception as e:
+            return self._error_response(e)
+    
+    async def process_message_stream(self, message: str) -> AsyncIterator[str]:
+        """Process an incoming message and stream the response as it is generated.
+        
+        Cached responses are yielded in one piece. Generated chunks are yielded
+        as they arrive and joined into the full response for history and caching.
+        
+        Args:
+            message (str): The incoming message to process
+            
+        Yields:
+            str: Chunks of the agent's response
+        """
+        # Add user message to history
+        self._add_to_history("user", message)
+        
+        try:
+            context = self._semantic_context()
+            cache_key = self._cache_key(self._get_context_prompt(), context[1], message)
+            use_semantic_cache = self._use_semantic_cache()
+            response = await self._lookup_cached_response(
+                message, cache_key, context, use_semantic_cache
+            )
             
-        except GeminiQuotaError as e:
-            error_response = "I apologize, but we are experiencing high demand. Please try again in a moment."
-            self._add_to_history("system", error_response)
-            return error_response
+            if response is None:
+                chunks: List[str] = []
+                async for chunk in self._generate_response_stream(message):
+                    chunks.append(chunk)
+                    yield chunk
+                response = "".join(chunks)
+                await self._cache_response(
+                    message, cache_key, context, response, use_semantic_cache
+                )
+            else:
+                yield response
             
-        except GeminiUnavailableError as e:
-            error_response = "I apologize, but the service is temporarily unavailable. Please try again later."
-            self._add_to_history("system", error_response)
-            return error_response
+            # Add response to history
+            self._add_to_history("assistant", response)
             
         except Exception as e:
-            logger.error(f"Error processing message: {str(e)}")
-            error_response = "I apologize, but I'm having trouble processing your request. Please try again in a moment."
-            self._add_to_history("system", error_response)
-            return error_response
+            yield self._error_response(e)
+    
+    def _use_semantic_cache(self) -> bool:
+        """Check whether the semantic cache applies to the current turn.
+        
+        Entries are scoped to the preceding turns by their context key, so
+        the cache applies however long the conversation history has grown.
+        
+        Returns:
+            bool: True if the semantic cache should be used
+        """
+        return self.cache_enabled and settings.SEMANTIC_CACHE_ENABLED
+    
+    def _semantic_context(self) -> Tuple[str, str]:
+        """Get the conversation context that scopes the current message.
+        
+        Returns:
+            Tuple[str, str]: Text of the turns preceding the current message,
+                and the context key of the user turns among them
+        """
+        # The current message is the last entry in the history
+        turns = list(self.conversation_history)[-(_SEMANTIC_CONTEXT_TURNS + 1):-1]
+        return (
+            "\n".join(turn["content"] for turn in turns),
+            context_key(turn["content"] for turn in turns if turn["role"] == "user")
+        )
+    
+    async def _lookup_cached_response(
+        self,
+        message: str,
+        cache_key: Tuple[str, bytes],
+        context: Tuple[str, str],
+        use_semantic_cache: bool
+    ) -> Optional[str]:
+        """Look up a response in the exact-match cache, then the semantic cache.
+        
+        Args:
+            message (str): The user message
+            cache_key (Tuple[str, bytes]): Exact-match cache key for the message
+            context (Tuple[str, str]): Conversation context from _semantic_context
+            use_semantic_cache (bool): Whether to fall back to the semantic cache
+            
+        Returns:
+            Optional[str]: The cached response, or None on a miss
+        """
+        response = self._get_cached_response(cache_key)
+        if response is None and use_semantic_cache:
+            response = await asyncio.to_thread(
+                self._sem_cache.lookup,
+                message,
+                context=context[0],
+                context_key=context[1]
+            )
+            if response is not None:
+                self._store_cached_response(cache_key, response)
+        return response
+    
+    async def _cache_response(
+        self,
+        message: str,
+        cache_key: Tuple[str, bytes],
+        context: Tuple[str, str],
+        response: str,
+        use_semantic_cache: bool
+    ):
+        """Store a generated response in the response caches.
+        
+        Args:
+            message (str): The user message
+            cache_key (Tuple[str, bytes]): Exact-match cache key for the message
+            context (Tuple[str, str]): Conversation context from _semantic_context
+            response (str): The generated response
+            use_semantic_cache (bool): Whether to insert into the semantic cache
+        """
+        self._store_cached_response(cache_key, response)
+        if use_semantic_cache:
+            await asyncio.to_thread(
+                self._sem_cache.insert,
+                message,
+                response,
+                context=context[0],
+                context_key=context[1]
+            )
+            self._sem_inserts += 1
+            if self._sem_inserts % self.persist_interval == 0:
+                self._schedule_persist()
     
-    def get_conversation_history(self) -> List[Dict[str, str]]:
+    def _error_response(self, error: Exception) -> str:
+        """Build the reply for a failed message and record it in history.
+        
+        Args:
+            error (Exception): The error raised while processing the message
+            
+        Returns:
+            str: The apology returned to the user
+        """
+        if isinstance(error, GeminiSafetyError):
+            error_response = _SAFETY_ERROR_RESPONSE
+        elif isinstance(error, GeminiQuotaError):
+            error_response = _QUOTA_ERROR_RESPONSE
+        elif isinstance(error, GeminiUnavailableError):
+            error_response = _UNAVAILABLE_ERROR_RESPONSE
+        else:
+            logger.error(f"Error processing message: {str(error)}")
+            error_response = _GENERIC_ERROR_RESPONSE
+        self._add_to_history("system", error_response)
+        return error_response
+    
+    def get_conversation_history(
+        self,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> List[Dict[str, str]]:
         """Get the conversation history.
         
+        Args:
+            limit (Optional[int]): Maximum number of messages to return, all if None
+            offset (int): Number of most recent messages to skip
+            
         Returns:
-            List[Dict[str, str]]: List of conversation messages
+            List[Dict[str, str]]: List of conversation messages with Unix timestamps, oldest first
         """
-        return self.conversation_history
+        # Walk back from the newest message so only the requested window is copied
+        stop = None if limit is None else offset + limit
+        window = list(islice(reversed(self.conversation_history), offset, stop))
+        window.reverse()
+        return [
+            {
+                **entry,
+                "timestamp": self._wall_clock_base + (entry["timestamp"] - self._monotonic_base_ns) / 1e9
+            }
+            for entry in window
+        ]
     
     def clear_conversation_history(self):
         """Clear the conversation history."""
         try:
-            self.conversation_history = []
+            self.conversation_history.clear()
         except Exception as e:
             logger.error(f"Failed to clear conversation history: {str(e)}") 
\ No newline at end of file
@@ -0,0 +1,183 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set
+import asyncio
+import logging
+from ..core.config import get_settings
+from ..core.rate_limiter import TokenBucket
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+@dataclass
+class _PendingRequest:
+    """A queued model request waiting to be dispatched."""
+    model: Any
+    contents: Any
+    kwargs: Dict[str, Any]
+    future: asyncio.Future = field(repr=False)
+
+class RequestBatcher:
+    """Dispatches Gemini requests centrally.
+    
+    Every request goes through a shared concurrency cap and, if configured,
+    a client-side token bucket, so the provider's limits are respected across
+    all agents and sessions. Gemini has no batch endpoint, so requests are
+    dispatched straight away by default; a collection window can be set to
+    smooth bursts into flushes of up to max_batch_size requests.
+    """
+    
+    def __init__(
+        self,
+        max_batch_size: int = settings.GEMINI_BATCH_MAX_SIZE,
+        max_wait: float = settings.GEMINI_BATCH_MAX_WAIT_MS / 1000.0,
+        max_concurrency: int = settings.GEMINI_MAX_CONCURRENCY,
+        requests_per_minute: int = settings.GEMINI_REQUESTS_PER_MINUTE
+    ):
+        """Initialize the batcher.
+        
+        Args:
+            max_batch_size (int): Maximum number of requests flushed together
+            max_wait (float): Seconds to wait for more requests before flushing
+            max_concurrency (int): Maximum number of in-flight requests
+            requests_per_minute (int): Client-side request rate limit, 0 for none
+        """
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.max_concurrency = max_concurrency
+        self._bucket: Optional[TokenBucket] = None
+        if requests_per_minute:
+            self._bucket = TokenBucket(requests_per_minute, requests_per_minute / 60.0)
+            self._seconds_per_token = 60.0 / requests_per_minute
+        
+        # Event loop bound state, created on first use in the running loop
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._flushes: Set[asyncio.Task] = set()
+    
+    def _bind_loop(self):
+        """Create the event loop bound state for the running loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._worker = None
+            self._flushes = set()
+    
+    def _ensure_worker(self):
+        """Start the background worker for the running event loop."""
+        if self._worker is None or self._worker.done():
+            self._worker = self._loop.create_task(self._run())
+    
+    async def submit(self, model: Any, contents: Any, **kwargs) -> Any:
+        """Queue a generate_content_async call and wait for its result.
+        
+        Args:
+            model: The Gemini model to call
+            contents: The request contents
+            **kwargs: Additional arguments for generate_content_async
+            
+        Returns:
+            The model response
+            
+        Raises:
+            Exception: Any error raised by the model call
+        """
+        self._bind_loop()
+        future = self._loop.create_future()
+        request = _PendingRequest(model, contents, kwargs, future)
+        
+        # Without a collection window there is nothing to coalesce, so skip
+        # the queue and dispatch in the caller's task
+        if self.max_wait <= 0:
+            await self._dispatch(request)
+            return future.result()
+            
+        self._ensure_worker()
+        await self._queue.put(request)
+        return await future
+    
+    async def close(self):
+        """Stop the worker and cancel queued and in-flight flushes.
+        
+        Called from the application lifespan on shutdown.
+        """
+        tasks = list(self._flushes)
+        if self._worker is not None:
+            tasks.append(self._worker)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        
+        # Fail requests still waiting in the queue for a flush
+        while self._queue is not None and not self._queue.empty():
+            request = self._queue.get_nowait()
+            if not request.future.done():
+                request.future.cancel()
+                
+        self._worker = None
+        self._flushes = set()
+    
+    async def _run(self):
+        """Drain the queue, flushing a batch when it is full or the window closes."""
+        while True:
+            batch: List[_PendingRequest] = [await self._queue.get()]
+            deadline = self._loop.time() + self.max_wait
+            
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - self._loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+                    
+            # Flush without blocking the next batch from being collected
+            task = self._loop.create_task(self._flush(batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+    
+    async def _flush(self, batch: List[_PendingRequest]):
+        """Dispatch a batch of requests concurrently.
+        
+        Args:
+            batch (List[_PendingRequest]): The requests to dispatch
+        """
+        await asyncio.gather(*(self._dispatch(request) for request in batch))
+    
+    async def _dispatch(self, request: _PendingRequest):
+        """Call the model for a single request and resolve its future.
+        
+        Args:
+            request (_PendingRequest): The request to dispatch
+        """
+        if request.future.done():
+            return
+            
+        async with self._semaphore:
+            if self._bucket is not None:
+                while not self._bucket.consume():
+                    await asyncio.sleep(self._seconds_per_token)
+                
+            try:
+                result = await request.model.generate_content_async(
+                    request.contents,
+                    **request.kwargs
+                )
+            except asyncio.CancelledError:
+                request.future.cancel()
+                raise
+            except Exception as e:
+                if not request.future.done():
+                    request.future.set_exception(e)
+            else:
+                if not request.future.done():
+                    request.future.set_result(result)
+
+# Global batcher instance
+batcher = RequestBatcher()
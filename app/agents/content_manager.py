@@ -1,10 +1,43 @@
 from typing import List, Any, Dict, Optional
+import re
 from .base import BaseAgent
 from datetime import datetime
 
+# Whitespace-delimited words, matching str.split() without building a list
+_WORD_RE = re.compile(r"\S+")
+
+def _count_words(text: str) -> int:
+    """Count whitespace-delimited words in a single pass."""
+    return sum(1 for _ in _WORD_RE.finditer(text))
+
+# Static sections of the content management context prompt
+_RESPONSIBILITIES_BLOCK = """Your primary responsibilities are:
+1. Help users create and optimize web content
+2. Provide content structure recommendations
+3. Assist with SEO optimization
+4. Guide content editing and improvements
+5. Help with content organization
+
+When handling content requests:
+- Understand the target audience and purpose
+- Consider SEO best practices
+- Maintain brand voice and style
+- Ensure content is engaging and valuable"""
+
+_FOOTER_BLOCK = """For content optimization:
+- Focus on readability and engagement
+- Incorporate relevant keywords naturally
+- Ensure proper content structure
+- Optimize for search engines while maintaining quality"""
+
 class ContentManagementAgent(BaseAgent):
     """Agent responsible for handling content-related inquiries and tasks."""
     
+    # Keyword categories, checked in priority order
+    _KEYWORD_AGENT = 'content'
+    _CATEGORY_TABLE = ('landing_page', 'blog_post', 'product_page', 'about_page', 'seo_content')
+    _DEFAULT_CATEGORY = 'social_media'
+    
     def __init__(self):
         super().__init__(
             name="Content Management Specialist",
@@ -19,48 +52,19 @@ class ContentManagementAgent(BaseAgent):
             'seo_content': 'SEO-optimized content',
             'social_media': 'Social media content'
         }
-    
-    def _get_context_prompt(self) -> str:
-        """Get the specialized context prompt for the content management agent."""
-        base_prompt = super()._get_context_prompt()
-        return f"""{base_prompt}
-
-        Your primary responsibilities are:
-        1. Help users create and optimize web content
-        2. Provide content structure recommendations
-        3. Assist with SEO optimization
-        4. Guide content editing and improvements
-        5. Help with content organization
-        
-        When handling content requests:
-        - Understand the target audience and purpose
-        - Consider SEO best practices
-        - Maintain brand voice and style
-        - Ensure content is engaging and valuable
-        
-        Content types you work with:
-        {self._format_content_types()}
-        
-        For content optimization:
-        - Focus on readability and engagement
-        - Incorporate relevant keywords naturally
-        - Ensure proper content structure
-        - Optimize for search engines while maintaining quality"""
+        self._formatted_content_types = "\n".join(
+            f"- {key}: {value}" for key, value in self.content_types.items()
+        )
+        self._context_prompt = "\n\n".join((
+            self._context_prompt,
+            _RESPONSIBILITIES_BLOCK,
+            f"Content types you work with:\n{self._formatted_content_types}",
+            _FOOTER_BLOCK
+        ))
     
     def _format_content_types(self) -> str:
         """Format the content types for the prompt."""
-        return "\n".join([f"- {key}: {value}" for key, value in self.content_types.items()])
-    
-    async def _generate_response(self, message: str) -> str:
-        """Generate a response using the Content Management Agent's specialized logic.
-        
-        Args:
-            message (str): The message to process
-            
-        Returns:
-            str: The generated response
-        """
-        return await super()._generate_response(message)
+        return self._formatted_content_types
     
     def analyze_content_type(self, content: str) -> str:
         """Analyze and categorize the type of content based on its characteristics.
@@ -71,21 +75,8 @@ class ContentManagementAgent(BaseAgent):
         Returns:
             str: The identified content type
         """
-        content_lower = content.lower()
-        
         # Simple keyword-based categorization
-        if any(word in content_lower for word in ['buy', 'pricing', 'features', 'hero section']):
-            return 'landing_page'
-        elif any(word in content_lower for word in ['article', 'post', 'blog']):
-            return 'blog_post'
-        elif any(word in content_lower for word in ['product', 'specification', 'details']):
-            return 'product_page'
-        elif any(word in content_lower for word in ['about', 'team', 'mission', 'vision']):
-            return 'about_page'
-        elif any(word in content_lower for word in ['seo', 'keyword', 'meta']):
-            return 'seo_content'
-        else:
-            return 'social_media'
+        return self._classify(content)
     
     def suggest_content_improvements(self, content: str) -> Dict[str, Any]:
         """Analyze content and suggest improvements.
@@ -110,7 +101,7 @@ class ContentManagementAgent(BaseAgent):
             suggestions['structure'].append('Consider using bullet points or lists')
             
         # Check SEO elements
-        if len(content.split()) < 300:
+        if _count_words(content) < 300:
             suggestions['seo'].append('Content might be too short for good SEO')
         if content.count('.') < 5:
             suggestions['readability'].append('Add more sentences for better flow')
@@ -134,7 +125,7 @@ class ContentManagementAgent(BaseAgent):
             Dict[str, Any]: Dictionary containing SEO recommendations
         """
         content_lower = content.lower()
-        word_count = len(content.split())
+        word_count = _count_words(content_lower)
         keyword_count = content_lower.count(target_keyword.lower())
         keyword_density = (keyword_count / word_count) * 100 if word_count > 0 else 0
         
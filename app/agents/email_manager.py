@@ -1,9 +1,33 @@
 from typing import List, Any, Dict
 from .base import BaseAgent
+from ._keyword_automaton import has_category
+
+# Static sections of the email management context prompt
+_RESPONSIBILITIES_BLOCK = """Your primary responsibilities are:
+1. Help users with email-related issues
+2. Troubleshoot email delivery problems
+3. Assist with email settings and preferences
+4. Handle spam and security concerns
+5. Manage notification preferences
+
+When handling email issues:
+- First identify the specific type of email problem
+- Ask for relevant details (e.g., email address, timing of issues)
+- Provide step-by-step solutions
+- Explain any technical terms in simple language"""
+
+_FOOTER_BLOCK = """If an issue requires technical intervention or system access:
+- Clearly explain what needs to be done
+- Indicate when escalation is needed"""
 
 class EmailManagementAgent(BaseAgent):
     """Agent responsible for handling email-related tasks and communications."""
     
+    # Keyword categories, checked in priority order
+    _KEYWORD_AGENT = 'email'
+    _CATEGORY_TABLE = ('spam', 'delivery', 'settings', 'notifications')
+    _DEFAULT_CATEGORY = 'technical'
+    
     def __init__(self):
         super().__init__(
             name="Email Management Specialist",
@@ -17,46 +41,19 @@ class EmailManagementAgent(BaseAgent):
             'notifications': 'Notification settings and management',
             'technical': 'Technical email issues'
         }
-    
-    def _get_context_prompt(self) -> str:
-        """Get the specialized context prompt for the email management agent."""
-        base_prompt = super()._get_context_prompt()
-        return f"""{base_prompt}
-
-        Your primary responsibilities are:
-        1. Help users with email-related issues
-        2. Troubleshoot email delivery problems
-        3. Assist with email settings and preferences
-        4. Handle spam and security concerns
-        5. Manage notification preferences
-        
-        When handling email issues:
-        - First identify the specific type of email problem
-        - Ask for relevant details (e.g., email address, timing of issues)
-        - Provide step-by-step solutions
-        - Explain any technical terms in simple language
-        
-        Categories of issues you handle:
-        {self._format_categories()}
-        
-        If an issue requires technical intervention or system access:
-        - Clearly explain what needs to be done
-        - Indicate when escalation is needed"""
+        self._formatted_categories = "\n".join(
+            f"- {key}: {value}" for key, value in self.email_categories.items()
+        )
+        self._context_prompt = "\n\n".join((
+            self._context_prompt,
+            _RESPONSIBILITIES_BLOCK,
+            f"Categories of issues you handle:\n{self._formatted_categories}",
+            _FOOTER_BLOCK
+        ))
     
     def _format_categories(self) -> str:
         """Format the email categories for the prompt."""
-        return "\n".join([f"- {key}: {value}" for key, value in self.email_categories.items()])
-    
-    async def _generate_response(self, message: str) -> str:
-        """Generate a response using the Email Management Agent's specialized logic.
-        
-        Args:
-            message (str): The message to process
-            
-        Returns:
-            str: The generated response
-        """
-        return await super()._generate_response(message)
+        return self._formatted_categories
     
     def categorize_email_issue(self, message: str) -> str:
         """Categorize the type of email issue based on the user's message.
@@ -67,19 +64,8 @@ class EmailManagementAgent(BaseAgent):
         Returns:
             str: The category of the email issue
         """
-        message_lower = message.lower()
-        
         # Simple keyword-based categorization
-        if any(word in message_lower for word in ['spam', 'junk', 'unwanted']):
-            return 'spam'
-        elif any(word in message_lower for word in ['delivery', 'receive', 'sent']):
-            return 'delivery'
-        elif any(word in message_lower for word in ['settings', 'preference', 'configure']):
-            return 'settings'
-        elif any(word in message_lower for word in ['notification', 'alert', 'update']):
-            return 'notifications'
-        else:
-            return 'technical'
+        return self._classify(message)
     
     def needs_escalation(self, message: str) -> bool:
         """Determine if the email issue needs escalation to technical support.
@@ -90,10 +76,4 @@ class EmailManagementAgent(BaseAgent):
         Returns:
             bool: True if escalation is needed, False otherwise
         """
-        escalation_keywords = [
-            'hack', 'breach', 'security', 'compromised', 'access',
-            'error', 'broken', 'technical', 'bug', 'system'
-        ]
-        
-        message_lower = message.lower()
-        return any(keyword in message_lower for keyword in escalation_keywords) 
\ No newline at end of file
+        return has_category(message, 'email', 'escalation') 
\ No newline at end of file
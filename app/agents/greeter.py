@@ -1,5 +1,40 @@
-from typing import List, Any
+from typing import List, Any, Optional
+import re
 from .base import BaseAgent
+from ._keyword_automaton import has_category
+
+# Static section of the greeter context prompt
+_RESPONSIBILITIES_BLOCK = """Your primary responsibilities are:
+1. Welcome customers warmly and professionally
+2. Understand their initial query or concern
+3. Provide immediate help for basic questions
+4. Identify when to route to specialized agents
+
+When greeting:
+- If this is the first interaction, introduce yourself
+- Be concise but friendly
+- Ask about how you can help
+
+For routing decisions:
+- Content/SEO issues → Content Management Agent
+- Product questions → Product Information Agent
+- Email/communication issues → Email Management Agent
+- Complex issues → Escalation Agent
+
+Always maintain context from the conversation history."""
+
+# Bare greetings answered without calling the model
+_GREETING_RE = re.compile(
+    r"^\s*(hi|hello|hey|good (morning|afternoon|evening)|howdy)\b[\s!.?]*$",
+    re.IGNORECASE
+)
+
+_GREETING_PREFIX = "Hello! Welcome to ChromaPages customer service. "
+
+_WELCOME_RESPONSE = (
+    "Hello! Welcome to ChromaPages customer service. I'm here to help with "
+    "your website, content, products, or email. How can I help you today?"
+)
 
 class GreeterAgent(BaseAgent):
     """Agent responsible for initial customer interactions and basic FAQ."""
@@ -11,48 +46,35 @@ class GreeterAgent(BaseAgent):
             understanding their needs, and providing basic assistance or routing them to specialized agents."
         )
         self.greeting_sent = False
+        self._context_prompt = "\n\n".join((self._context_prompt, _RESPONSIBILITIES_BLOCK))
     
-    def _get_context_prompt(self) -> str:
-        """Get the specialized context prompt for the greeter agent."""
-        base_prompt = super()._get_context_prompt()
-        return f"""{base_prompt}
-
-        Your primary responsibilities are:
-        1. Welcome customers warmly and professionally
-        2. Understand their initial query or concern
-        3. Provide immediate help for basic questions
-        4. Identify when to route to specialized agents
-        
-        When greeting:
-        - If this is the first interaction, introduce yourself
-        - Be concise but friendly
-        - Ask about how you can help
-        
-        For routing decisions:
-        - Content/SEO issues → Content Management Agent
-        - Product questions → Product Information Agent
-        - Email/communication issues → Email Management Agent
-        - Complex issues → Escalation Agent
+    def _preprocess(self, message: str) -> Optional[str]:
+        """Answer a plain first-turn greeting directly.
         
-        Always maintain context from the conversation history."""
+        Args:
+            message (str): The user message
+            
+        Returns:
+            Optional[str]: The welcome response, or None to generate one
+        """
+        if not self.greeting_sent and _GREETING_RE.match(message):
+            self.greeting_sent = True
+            return _WELCOME_RESPONSE
+        return None
     
-    async def _generate_response(self, message: str) -> str:
-        """Generate a response using the Greeter's specialized logic.
+    def _postprocess(self, response: str, message: str) -> str:
+        """Greet the customer at the start of the first response.
         
         Args:
-            message (str): The message to process
+            response (str): The generated response
+            message (str): The user message
             
         Returns:
-            str: The generated response
+            str: The response, with the greeting on the first interaction
         """
-        response = await super()._generate_response(message)
-        
-        # If this is the first interaction and we haven't sent a greeting
         if not self.greeting_sent and len(self.conversation_history) <= 2:
             self.greeting_sent = True
-            greeting = "Hello! Welcome to ChromaPages customer service. "
-            response = greeting + response
-        
+            return _GREETING_PREFIX + response
         return response
     
     def should_route_to_specialist(self, message: str) -> bool:
@@ -65,20 +87,4 @@ class GreeterAgent(BaseAgent):
             bool: True if the conversation should be routed, False otherwise
         """
         # This is a simple check - in a real system, you'd want more sophisticated logic
-        specialist_keywords = {
-            'content': 'content_management',
-            'seo': 'content_management',
-            'website': 'content_management',
-            'product': 'product_info',
-            'feature': 'product_info',
-            'email': 'email_management',
-            'notification': 'email_management',
-            'technical': 'escalation'
-        }
-        
-        message_lower = message.lower()
-        for keyword in specialist_keywords:
-            if keyword in message_lower:
-                return True
-        
-        return False 
\ No newline at end of file
+        return has_category(message, 'greeter', 'specialist') 
\ No newline at end of file
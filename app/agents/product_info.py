@@ -1,9 +1,79 @@
-from typing import List, Any, Dict, Optional
+from types import MappingProxyType
+from typing import List, Any, Dict, Mapping, Optional
 from .base import BaseAgent
 
+# Feature details, shared read-only across calls
+_FEATURE_DETAILS: Mapping[str, Mapping[str, Any]] = MappingProxyType({
+    'website_builder': MappingProxyType({
+        'name': 'Drag-and-Drop Website Builder',
+        'description': 'Intuitive visual website builder with real-time preview',
+        'key_features': (
+            'Visual drag-and-drop interface',
+            'Real-time preview',
+            'Responsive design tools',
+            'Custom CSS/HTML support'
+        ),
+        'included_in_plans': ('Basic', 'Pro', 'Business')
+    }),
+    'templates': MappingProxyType({
+        'name': 'Professional Templates',
+        'description': 'Customizable templates for various industries',
+        'key_features': (
+            'Industry-specific designs',
+            'Mobile-responsive layouts',
+            'Customization options',
+            'Regular updates'
+        ),
+        'included_in_plans': ('Basic', 'Pro', 'Business')
+    }),
+    'ecommerce': MappingProxyType({
+        'name': 'E-commerce Suite',
+        'description': 'Complete e-commerce functionality',
+        'key_features': (
+            'Product management',
+            'Secure checkout',
+            'Payment gateway integration',
+            'Order tracking'
+        ),
+        'included_in_plans': ('Pro', 'Business')
+    })
+})
+
+_FEATURE_FALLBACK: Mapping[str, Any] = MappingProxyType({
+    'name': 'Feature',
+    'description': 'Feature information not found',
+    'key_features': (),
+    'included_in_plans': ()
+})
+
+# Static sections of the product information context prompt
+_RESPONSIBILITIES_BLOCK = """Your primary responsibilities are:
+1. Explain ChromaPages features and capabilities
+2. Help users understand our different plans
+3. Provide template recommendations
+4. Explain technical requirements
+5. Compare features with alternatives
+
+When providing product information:
+- Focus on ChromaPages' unique benefits
+- Explain features in user-friendly terms
+- Provide specific examples and use cases
+- Recommend appropriate solutions"""
+
+_FOOTER_BLOCK = """For recommendations:
+- Understand the user's specific needs
+- Consider technical expertise level
+- Explain the reasoning behind suggestions
+- Highlight relevant features"""
+
 class ProductInformationAgent(BaseAgent):
     """Agent responsible for handling product-related inquiries and information."""
     
+    # Keyword categories, checked in priority order
+    _KEYWORD_AGENT = 'product'
+    _CATEGORY_TABLE = ('website_builder', 'templates', 'ecommerce', 'hosting', 'integrations')
+    _DEFAULT_CATEGORY = 'analytics'
+    
     def __init__(self):
         super().__init__(
             name="Product Information Specialist",
@@ -18,48 +88,19 @@ class ProductInformationAgent(BaseAgent):
             'integrations': 'Third-party integrations and plugins',
             'analytics': 'Website analytics and reporting'
         }
-    
-    def _get_context_prompt(self) -> str:
-        """Get the specialized context prompt for the product information agent."""
-        base_prompt = super()._get_context_prompt()
-        return f"""{base_prompt}
-
-        Your primary responsibilities are:
-        1. Explain ChromaPages features and capabilities
-        2. Help users understand our different plans
-        3. Provide template recommendations
-        4. Explain technical requirements
-        5. Compare features with alternatives
-        
-        When providing product information:
-        - Focus on ChromaPages' unique benefits
-        - Explain features in user-friendly terms
-        - Provide specific examples and use cases
-        - Recommend appropriate solutions
-        
-        Product categories you specialize in:
-        {self._format_categories()}
-        
-        For recommendations:
-        - Understand the user's specific needs
-        - Consider technical expertise level
-        - Explain the reasoning behind suggestions
-        - Highlight relevant features"""
+        self._formatted_categories = "\n".join(
+            f"- {key}: {value}" for key, value in self.product_categories.items()
+        )
+        self._context_prompt = "\n\n".join((
+            self._context_prompt,
+            _RESPONSIBILITIES_BLOCK,
+            f"Product categories you specialize in:\n{self._formatted_categories}",
+            _FOOTER_BLOCK
+        ))
     
     def _format_categories(self) -> str:
         """Format the product categories for the prompt."""
-        return "\n".join([f"- {key}: {value}" for key, value in self.product_categories.items()])
-    
-    async def _generate_response(self, message: str) -> str:
-        """Generate a response using the Product Information Agent's specialized logic.
-        
-        Args:
-            message (str): The message to process
-            
-        Returns:
-            str: The generated response
-        """
-        return await super()._generate_response(message)
+        return self._formatted_categories
     
     def categorize_product_query(self, message: str) -> str:
         """Categorize the type of product query based on the user's message.
@@ -70,73 +111,19 @@ class ProductInformationAgent(BaseAgent):
         Returns:
             str: The category of the product query
         """
-        message_lower = message.lower()
-        
         # Simple keyword-based categorization
-        if any(word in message_lower for word in ['builder', 'create', 'design', 'edit']):
-            return 'website_builder'
-        elif any(word in message_lower for word in ['template', 'theme', 'layout']):
-            return 'templates'
-        elif any(word in message_lower for word in ['shop', 'store', 'ecommerce', 'payment']):
-            return 'ecommerce'
-        elif any(word in message_lower for word in ['host', 'domain', 'ssl']):
-            return 'hosting'
-        elif any(word in message_lower for word in ['integrate', 'plugin', 'connect']):
-            return 'integrations'
-        else:
-            return 'analytics'
+        return self._classify(message)
     
-    def get_feature_details(self, feature: str) -> Dict[str, Any]:
+    def get_feature_details(self, feature: str) -> Mapping[str, Any]:
         """Get detailed information about a specific feature.
         
         Args:
             feature (str): The feature to get details for
             
         Returns:
-            Dict[str, Any]: Dictionary containing feature details
+            Mapping[str, Any]: Read-only mapping containing feature details
         """
-        features = {
-            'website_builder': {
-                'name': 'Drag-and-Drop Website Builder',
-                'description': 'Intuitive visual website builder with real-time preview',
-                'key_features': [
-                    'Visual drag-and-drop interface',
-                    'Real-time preview',
-                    'Responsive design tools',
-                    'Custom CSS/HTML support'
-                ],
-                'included_in_plans': ['Basic', 'Pro', 'Business']
-            },
-            'templates': {
-                'name': 'Professional Templates',
-                'description': 'Customizable templates for various industries',
-                'key_features': [
-                    'Industry-specific designs',
-                    'Mobile-responsive layouts',
-                    'Customization options',
-                    'Regular updates'
-                ],
-                'included_in_plans': ['Basic', 'Pro', 'Business']
-            },
-            'ecommerce': {
-                'name': 'E-commerce Suite',
-                'description': 'Complete e-commerce functionality',
-                'key_features': [
-                    'Product management',
-                    'Secure checkout',
-                    'Payment gateway integration',
-                    'Order tracking'
-                ],
-                'included_in_plans': ['Pro', 'Business']
-            }
-        }
-        
-        return features.get(feature, {
-            'name': 'Feature',
-            'description': 'Feature information not found',
-            'key_features': [],
-            'included_in_plans': []
-        })
+        return _FEATURE_DETAILS.get(feature, _FEATURE_FALLBACK)
     
     def check_product_availability(self, product_id: str) -> Dict[str, Any]:
         """Check the availability of a product.
@@ -1,12 +1,16 @@
-from fastapi import APIRouter, HTTPException, Depends, status, Path
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, Field
-from typing import Dict, List, Optional, Any
+from fastapi import APIRouter, Body, HTTPException, Depends, Request, status, Path, Query
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Awaitable, Callable, Dict, List, Optional, Any, Union
+import asyncio
 import logging
+from .base import BaseAgent
 from .greeter import GreeterAgent
 from .email_manager import EmailManagementAgent
 from .content_manager import ContentManagementAgent
 from .product_info import ProductInformationAgent
+from ._keyword_automaton import first_category
+from ..core.rate_limiter import rate_limiter
 from ..core.exceptions import (
     BaseCustomException,
     ContentBlockedError,
@@ -19,6 +23,16 @@ from ..core.exceptions import (
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Specialist agents suggested by the greeter, checked in priority order
+_ROUTING_CATEGORIES = ('content', 'email', 'product')
+
+# Agent types accepted by the endpoints, in display order
+_AGENT_TYPES = ("greeter", "email", "content", "product")
+_VALID_AGENT_TYPES = frozenset(_AGENT_TYPES)
+
+# Maximum number of messages accepted by the batch chat endpoint
+_MAX_BATCH_SIZE = 100
+
 router = APIRouter(
     prefix="/api/agents",
     tags=["agents"],
@@ -34,15 +48,35 @@ router = APIRouter(
     }
 )
 
-# Initialize agents
-try:
-    greeter_agent = GreeterAgent()
-    email_agent = EmailManagementAgent()
-    content_agent = ContentManagementAgent()
-    product_agent = ProductInformationAgent()
-except Exception as e:
-    logger.error(f"Failed to initialize agents: {str(e)}")
-    raise
+def create_agents() -> Dict[str, BaseAgent]:
+    """Create one instance of each agent type.
+    
+    Called once per worker from the application lifespan.
+    
+    Returns:
+        Dict[str, BaseAgent]: Agents keyed by agent type
+    """
+    try:
+        return {
+            "greeter": GreeterAgent(),
+            "email": EmailManagementAgent(),
+            "content": ContentManagementAgent(),
+            "product": ProductInformationAgent()
+        }
+    except Exception as e:
+        logger.error(f"Failed to initialize agents: {str(e)}")
+        raise
+
+def get_agents(request: Request) -> Dict[str, BaseAgent]:
+    """Get the agents created for this worker.
+    
+    Args:
+        request (Request): The incoming request
+        
+    Returns:
+        Dict[str, BaseAgent]: Agents keyed by agent type
+    """
+    return request.app.state.agents
 
 class Message(BaseModel):
     """Message model for requests."""
@@ -50,22 +84,21 @@ class Message(BaseModel):
         ...,
         description="The message content to be processed by the agent",
         min_length=1,
-        max_length=1000,
-        example="Hi, I need help with ChromaPages"
+        max_length=1000
     )
     agent_type: Optional[str] = Field(
         default="greeter",
-        description="The type of agent to handle the message",
-        example="greeter"
+        description="The type of agent to handle the message"
     )
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "content": "Hi, I need help with ChromaPages",
                 "agent_type": "greeter"
             }
         }
+    )
 
 class ErrorResponse(BaseModel):
     """Model for error responses."""
@@ -91,8 +124,8 @@ class ChatResponse(BaseModel):
         description="Error details if an error occurred"
     )
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "response": "Hello! Welcome to ChromaPages. How can I help you today?",
                 "agent_type": "greeter",
@@ -101,6 +134,90 @@ class ChatResponse(BaseModel):
                 "error": None
             }
         }
+    )
+
+async def _handle_greeter(agent: GreeterAgent, content: str) -> ChatResponse:
+    """Process a message with the greeter and suggest a specialist if needed."""
+    response = await agent.process_message(content)
+    should_route = agent.should_route_to_specialist(content)
+    suggested_agent = get_suggested_agent(content) if should_route else None
+    
+    return ChatResponse(
+        response=response,
+        agent_type="greeter",
+        should_route=should_route,
+        suggested_agent=suggested_agent
+    )
+
+async def _handle_email(agent: EmailManagementAgent, content: str) -> ChatResponse:
+    """Process a message with the email agent and flag escalations."""
+    response = await agent.process_message(content)
+    return ChatResponse(
+        response=response,
+        agent_type="email",
+        should_route=agent.needs_escalation(content)
+    )
+
+async def _handle_content(agent: ContentManagementAgent, content: str) -> ChatResponse:
+    """Process a message with the content agent."""
+    response = await agent.process_message(content)
+    return ChatResponse(
+        response=response,
+        agent_type="content"
+    )
+
+async def _handle_product(agent: ProductInformationAgent, content: str) -> ChatResponse:
+    """Process a message with the product agent."""
+    response = await agent.process_message(content)
+    return ChatResponse(
+        response=response,
+        agent_type="product"
+    )
+
+# Chat handler per agent type
+AGENT_DISPATCH: Dict[str, Callable[[Any, str], Awaitable[ChatResponse]]] = {
+    "greeter": _handle_greeter,
+    "email": _handle_email,
+    "content": _handle_content,
+    "product": _handle_product
+}
+
+def _error_body(message: Message, response: str, error_details: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a chat error body without validating it into a ChatResponse."""
+    return {
+        "response": response,
+        "agent_type": message.agent_type,
+        "should_route": False,
+        "suggested_agent": None,
+        "error": error_details
+    }
+
+async def _chat(message: Message, agents: Dict[str, BaseAgent]) -> Union[ChatResponse, Dict[str, Any]]:
+    """Process a chat message, returning a plain error body if it fails."""
+    try:
+        # Reject unknown agent types before doing any other work
+        if message.agent_type not in _VALID_AGENT_TYPES:
+            raise ValidationError("Invalid agent type", {"valid_types": list(_AGENT_TYPES)})
+            
+        if not message.content.strip():
+            raise ValidationError("Message content cannot be empty")
+            
+        handler = AGENT_DISPATCH[message.agent_type]
+        return await handler(agents[message.agent_type], message.content)
+            
+    except BaseCustomException as e:
+        error_details = handle_agent_error(e)
+        logger.error(f"Agent error: {error_details}")
+        return _error_body(message, error_details["message"], error_details)
+        
+    except Exception as e:
+        logger.error(f"Unexpected error in chat endpoint: {str(e)}")
+        error_details = handle_agent_error(e)
+        return _error_body(
+            message,
+            "An unexpected error occurred. Please try again later.",
+            error_details
+        )
 
 @router.post(
     "/chat",
@@ -130,80 +247,85 @@ class ChatResponse(BaseModel):
     Rate limits apply to prevent abuse.
     """
 )
-async def chat(message: Message):
+async def chat(message: Message, agents: Dict[str, BaseAgent] = Depends(get_agents)):
     """Handle chat messages and route to appropriate agents."""
-    try:
-        if not message.content.strip():
-            raise ValidationError("Message content cannot be empty")
-            
-        if message.agent_type == "greeter":
-            response = await greeter_agent.process_message(message.content)
-            should_route = greeter_agent.should_route_to_specialist(message.content)
-            suggested_agent = get_suggested_agent(message.content) if should_route else None
-            
-            return ChatResponse(
-                response=response,
-                agent_type="greeter",
-                should_route=should_route,
-                suggested_agent=suggested_agent
-            )
-            
-        elif message.agent_type == "email":
-            response = await email_agent.process_message(message.content)
-            return ChatResponse(
-                response=response,
-                agent_type="email",
-                should_route=email_agent.needs_escalation(message.content)
+    result = await _chat(message, agents)
+    if isinstance(result, ChatResponse):
+        return result
+    return ORJSONResponse(status_code=result["error"]["status_code"], content=result)
+
+@router.post(
+    "/chat/batch",
+    response_model=List[ChatResponse],
+    responses={
+        status.HTTP_200_OK: {
+            "description": "Successfully processed the messages",
+            "model": List[ChatResponse]
+        },
+        status.HTTP_429_TOO_MANY_REQUESTS: {
+            "description": "Rate limit exceeded",
+            "model": ErrorResponse
+        }
+    },
+    summary="Process a batch of chat messages",
+    description=f"""
+    Process up to {_MAX_BATCH_SIZE} chat messages concurrently in a single request.
+    
+    Each message is handled exactly as by the chat endpoint, and the responses are
+    returned in the same order as the messages. A failure in one message is reported
+    in its own response and does not affect the others.
+    
+    Each message counts as one request against the rate limits.
+    """
+)
+async def chat_batch(
+    request: Request,
+    messages: List[Message] = Body(..., min_length=1, max_length=_MAX_BATCH_SIZE),
+    agents: Dict[str, BaseAgent] = Depends(get_agents)
+):
+    """Handle a batch of chat messages concurrently."""
+    # The rate limit middleware charged the batch as one request; charge the
+    # other messages before any of them reach an agent
+    rate_limit_client = getattr(request.state, "rate_limit_client", None)
+    if rate_limit_client is not None and len(messages) > 1:
+        try:
+            request.state.rate_limit_remaining = rate_limiter.check_and_get_quota(
+                *rate_limit_client,
+                cost=len(messages) - 1
             )
-            
-        elif message.agent_type == "content":
-            response = await content_agent.process_message(message.content)
-            return ChatResponse(
-                response=response,
-                agent_type="content"
+        except RateLimitError as e:
+            error_details = handle_agent_error(e)
+            return ORJSONResponse(
+                status_code=error_details["status_code"],
+                content={
+                    "error": error_details["error_type"],
+                    "message": error_details["message"],
+                    "details": error_details["details"]
+                }
             )
             
-        elif message.agent_type == "product":
-            response = await product_agent.process_message(message.content)
-            return ChatResponse(
-                response=response,
-                agent_type="product"
+    results = await asyncio.gather(
+        *(_chat(message, agents) for message in messages),
+        return_exceptions=True
+    )
+    
+    responses = []
+    for message, result in zip(messages, results):
+        if isinstance(result, Exception):
+            logger.error(f"Unexpected error in chat batch: {str(result)}")
+            result = _error_body(
+                message,
+                "An unexpected error occurred. Please try again later.",
+                handle_agent_error(result)
             )
-            
-        else:
-            raise ValidationError("Invalid agent type", {"valid_types": ["greeter", "email", "content", "product"]})
-            
-    except BaseCustomException as e:
-        error_details = handle_agent_error(e)
-        logger.error(f"Agent error: {error_details}")
-        return ChatResponse(
-            response=error_details["message"],
-            agent_type=message.agent_type,
-            error=error_details
-        )
-        
-    except Exception as e:
-        logger.error(f"Unexpected error in chat endpoint: {str(e)}")
-        error_details = handle_agent_error(e)
-        return ChatResponse(
-            response="An unexpected error occurred. Please try again later.",
-            agent_type=message.agent_type,
-            error=error_details
-        )
+        responses.append(result)
+    return responses
 
 def get_suggested_agent(message: str) -> Optional[str]:
     """Determine which specialist agent to route to based on message content."""
     try:
-        message_lower = message.lower()
-        
-        if any(word in message_lower for word in ['content', 'page', 'seo', 'blog', 'website']):
-            return "content"
-        elif any(word in message_lower for word in ['email', 'spam', 'newsletter']):
-            return "email"
-        elif any(word in message_lower for word in ['product', 'item', 'price', 'stock']):
-            return "product"
-        
-        return None
+        # One automaton scan, shared with the greeter's routing check
+        return first_category(message, 'routing', _ROUTING_CATEGORIES)
         
     except Exception as e:
         logger.error(f"Error in agent suggestion: {str(e)}")
@@ -222,6 +344,32 @@ class AgentTypesResponse(BaseModel):
         description="List of available agent types"
     )
 
+# The agent types never change, so the response body is serialized once
+_AGENT_TYPES_BODY = AgentTypesResponse(
+    available_agents=[
+        AgentType(
+            type="greeter",
+            name="Customer Service Greeter",
+            description="Initial contact and routing agent"
+        ),
+        AgentType(
+            type="email",
+            name="Email Management Specialist",
+            description="Handles email-related inquiries"
+        ),
+        AgentType(
+            type="content",
+            name="Content Management Specialist",
+            description="Handles content creation and optimization"
+        ),
+        AgentType(
+            type="product",
+            name="Product Information Specialist",
+            description="Provides product information and recommendations"
+        )
+    ]
+).model_dump_json().encode()
+
 @router.get(
     "/types",
     response_model=AgentTypesResponse,
@@ -236,37 +384,7 @@ class AgentTypesResponse(BaseModel):
 )
 async def get_agent_types():
     """Get available agent types."""
-    try:
-        return AgentTypesResponse(
-            available_agents=[
-                AgentType(
-                    type="greeter",
-                    name="Customer Service Greeter",
-                    description="Initial contact and routing agent"
-                ),
-                AgentType(
-                    type="email",
-                    name="Email Management Specialist",
-                    description="Handles email-related inquiries"
-                ),
-                AgentType(
-                    type="content",
-                    name="Content Management Specialist",
-                    description="Handles content creation and optimization"
-                ),
-                AgentType(
-                    type="product",
-                    name="Product Information Specialist",
-                    description="Provides product information and recommendations"
-                )
-            ]
-        )
-    except Exception as e:
-        logger.error(f"Error retrieving agent types: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve agent types"
-        )
+    return Response(content=_AGENT_TYPES_BODY, media_type="application/json")
 
 class ConversationMessage(BaseModel):
     """Model for a conversation message."""
@@ -298,33 +416,40 @@ class ConversationHistoryResponse(BaseModel):
     description="""
     Retrieve the conversation history for a specific agent type.
     
-    The history includes all messages exchanged with the agent, including
-    user messages, agent responses, and system messages.
+    The history includes messages exchanged with the agent, including
+    user messages, agent responses, and system messages. The most recent
+    `limit` messages are returned, skipping the newest `offset` messages.
     """
 )
 async def get_conversation_history(
     agent_type: str = Path(
         ...,
         description="The type of agent to get history for",
-        example="greeter"
-    )
+        examples=["greeter"]
+    ),
+    limit: int = Query(
+        50,
+        ge=1,
+        description="Maximum number of messages to return"
+    ),
+    offset: int = Query(
+        0,
+        ge=0,
+        description="Number of most recent messages to skip"
+    ),
+    agents: Dict[str, BaseAgent] = Depends(get_agents)
 ):
     """Get conversation history for a specific agent."""
     try:
-        if agent_type == "greeter":
-            return ConversationHistoryResponse(history=greeter_agent.get_conversation_history())
-        elif agent_type == "email":
-            return ConversationHistoryResponse(history=email_agent.get_conversation_history())
-        elif agent_type == "content":
-            return ConversationHistoryResponse(history=content_agent.get_conversation_history())
-        elif agent_type == "product":
-            return ConversationHistoryResponse(history=product_agent.get_conversation_history())
-        else:
+        if agent_type not in _VALID_AGENT_TYPES:
             raise ValidationError(
                 "Invalid agent type",
-                {"valid_types": ["greeter", "email", "content", "product"]}
+                {"valid_types": list(_AGENT_TYPES)}
             )
             
+        # History entries are already plain dicts, so skip re-validating them
+        return ORJSONResponse({"history": agents[agent_type].get_conversation_history(limit, offset)})
+            
     except ValidationError as e:
         error_details = handle_agent_error(e)
         raise HTTPException(
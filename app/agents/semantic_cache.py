@@ -0,0 +1,433 @@
+from collections import OrderedDict
+from functools import lru_cache
+from hashlib import blake2b
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+import os
+import threading
+import logging
+import numpy as np
+from ..core.config import get_settings
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+_embedder = None
+_embedder_failed = False
+_embedder_lock = threading.Lock()
+
+def _get_embedder():
+    """Get the shared sentence-transformers model, loading it on first use.
+    
+    Returns:
+        The embedding model, or None if it could not be loaded
+    """
+    global _embedder, _embedder_failed
+    if _embedder is None and not _embedder_failed:
+        with _embedder_lock:
+            if _embedder is None and not _embedder_failed:
+                try:
+                    from sentence_transformers import SentenceTransformer
+                    _embedder = SentenceTransformer(settings.SEMANTIC_CACHE_MODEL)
+                except Exception as e:
+                    _embedder_failed = True
+                    logger.warning(f"Semantic cache disabled, failed to load embedder: {str(e)}")
+    return _embedder
+
+@lru_cache(maxsize=256)
+def embed(text: str) -> Optional[np.ndarray]:
+    """Embed text as an L2-normalized float32 vector.
+    
+    Args:
+        text (str): The text to embed
+        
+    Returns:
+        Optional[np.ndarray]: Read-only unit vector, or None if no embedder is available
+    """
+    embedder = _get_embedder()
+    if embedder is None:
+        return None
+    vector = np.asarray(
+        embedder.encode(text, normalize_embeddings=True),
+        dtype=np.float32
+    )
+    vector.setflags(write=False)
+    return vector
+
+class SemanticCacheStore:
+    """On-disk long-term store for frequently used semantic cache entries.
+    
+    Entries are kept in one .npz file per namespace, sorted by hit count, so
+    a restarted process can warm its in-memory cache with a single read.
+    """
+    
+    def __init__(
+        self,
+        namespace: str,
+        directory: str = settings.SEMANTIC_CACHE_STORE_DIR,
+        max_entries: int = settings.SEMANTIC_CACHE_MAX_ENTRIES
+    ):
+        """Initialize the store.
+        
+        Args:
+            namespace (str): Namespace isolating this store (usually the agent class)
+            directory (str): Directory holding the store files
+            max_entries (int): Maximum number of entries kept on disk
+        """
+        self.path = Path(directory) / f"{namespace}.npz"
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+    
+    def load(self) -> Optional[Dict[str, np.ndarray]]:
+        """Read all stored entries.
+        
+        Returns:
+            Optional[Dict[str, np.ndarray]]: Stored arrays, or None if nothing is stored
+        """
+        if not self.path.exists():
+            return None
+        try:
+            with np.load(self.path) as data:
+                return {name: data[name] for name in data.files}
+        except Exception as e:
+            logger.warning(f"Failed to load semantic cache store {self.path}: {str(e)}")
+            return None
+    
+    def upsert(self, entries: Dict[str, np.ndarray]):
+        """Merge entries into the store and write it back in one batch.
+        
+        Entries are matched by message digest. Stored entries embedded in a
+        different space than the new ones are dropped rather than mixed.
+        
+        Args:
+            entries (Dict[str, np.ndarray]): Arrays produced by SemanticCache.top_entries
+        """
+        with self._lock:
+            stored = self.load()
+            if stored is not None and _same_space(stored, entries):
+                hits = dict(zip(stored["keys"].tolist(), stored["hits"].tolist()))
+                rows = {key: (stored, i) for i, key in enumerate(stored["keys"].tolist())}
+                for i, key in enumerate(entries["keys"].tolist()):
+                    hits[key] = max(hits.get(key, 0), int(entries["hits"][i]))
+                    rows[key] = (entries, i)
+            else:
+                hits = dict(zip(entries["keys"].tolist(), entries["hits"].tolist()))
+                rows = {key: (entries, i) for i, key in enumerate(entries["keys"].tolist())}
+                
+            # Keep the most frequently hit entries first
+            keys = sorted(hits, key=hits.get, reverse=True)[:self.max_entries]
+            merged = {
+                "keys": np.array(keys, dtype="U32"),
+                "hits": np.array([hits[key] for key in keys], dtype=np.int64),
+                "vectors": np.stack([rows[key][0]["vectors"][rows[key][1]] for key in keys]),
+                "responses": np.array([rows[key][0]["responses"][rows[key][1]] for key in keys]),
+                "contexts": np.array(
+                    [rows[key][0]["contexts"][rows[key][1]] for key in keys],
+                    dtype="U32"
+                ),
+            }
+            if "components" in entries:
+                merged["mean"] = entries["mean"]
+                merged["components"] = entries["components"]
+                
+            # Write to a temporary file first so readers never see a partial store
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "wb") as f:
+                np.savez(f, **merged)
+            os.replace(tmp_path, self.path)
+            logger.info(f"Persisted {len(keys)} semantic cache entries to {self.path}")
+
+def _same_space(a: Dict[str, np.ndarray], b: Dict[str, np.ndarray]) -> bool:
+    """Check whether two sets of entries were embedded in the same space."""
+    if a["vectors"].shape[1] != b["vectors"].shape[1] or "contexts" not in a:
+        return False
+    if ("components" in a) != ("components" in b):
+        return False
+    return "components" not in a or (
+        np.array_equal(a["components"], b["components"])
+        and np.array_equal(a["mean"], b["mean"])
+    )
+
+def _digest(text: str) -> str:
+    """Get a compact hex digest identifying a message or conversation context."""
+    return blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+def context_key(user_turns: Iterable[str]) -> str:
+    """Get the key identifying the user turns that precede a message.
+    
+    Args:
+        user_turns (Iterable[str]): Earlier user messages, oldest first
+        
+    Returns:
+        str: Digest of the turns, or an empty string when there are none
+    """
+    turns = "\0".join(user_turns)
+    return _digest(turns) if turns else ""
+
+def _embedding_text(message: str, context: str) -> str:
+    """Get the text embedded for a message asked in a conversation context."""
+    return f"{context}\n{message}" if context else message
+
+class SemanticCache:
+    """LRU cache of agent responses matched by embedding similarity.
+    
+    Once enough entries have been inserted, a PCA projection is fitted and
+    all cached embeddings are stored in the lower-dimensional space, which
+    shrinks the similarity matmul and the memory held by the cache.
+    
+    Entries are embedded together with the preceding conversation turns and
+    tagged with a key of the preceding user turns. A paraphrase only counts
+    as a hit when its context key matches, so short replies like "yes,
+    please" are never answered from an unrelated conversation.
+    
+    With a store attached, the most frequently hit entries are periodically
+    persisted and used to warm the cache on startup.
+    """
+    
+    def __init__(
+        self,
+        namespace: str,
+        max_entries: int = settings.SEMANTIC_CACHE_MAX_ENTRIES,
+        n_components: int = settings.SEMANTIC_CACHE_PCA_COMPONENTS,
+        fit_size: int = settings.SEMANTIC_CACHE_PCA_FIT_SIZE,
+        store: Optional[SemanticCacheStore] = None
+    ):
+        """Initialize the semantic cache.
+        
+        Args:
+            namespace (str): Namespace isolating this cache (usually the agent class)
+            max_entries (int): Maximum number of cached responses
+            n_components (int): Dimensions to project embeddings to
+            fit_size (int): Number of inserts to collect before fitting the projection
+            store (Optional[SemanticCacheStore]): Long-term store for frequent entries
+        """
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.n_components = n_components
+        self.fit_size = fit_size
+        self.store = store
+        # Row index in the embedding matrix -> response, in LRU order
+        self._responses: "OrderedDict[int, str]" = OrderedDict()
+        # Row index -> context key the entry was cached under
+        self._contexts: Dict[int, str] = {}
+        # Row index -> message digest and hit count, for promotion to the store
+        self._keys: Dict[int, str] = {}
+        self._hits: Dict[int, int] = {}
+        self._matrix: Optional[np.ndarray] = None
+        self._mean: Optional[np.ndarray] = None
+        self._components: Optional[np.ndarray] = None
+        self._inserts = 0
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._responses)
+    
+    @property
+    def threshold(self) -> float:
+        """Default similarity threshold for the current embedding space."""
+        if self._components is None:
+            return settings.SEMANTIC_CACHE_THRESHOLD
+        return settings.SEMANTIC_CACHE_PCA_THRESHOLD
+    
+    def _project(self, vector: np.ndarray) -> np.ndarray:
+        """Project a raw embedding into the cache's embedding space.
+        
+        Args:
+            vector (np.ndarray): Unit-length raw embedding
+            
+        Returns:
+            np.ndarray: Unit-length embedding in the cache's space
+        """
+        if self._components is None:
+            return vector
+        projected = (vector - self._mean) @ self._components.T
+        norm = np.linalg.norm(projected)
+        return projected / norm if norm > 0 else projected
+    
+    def _fit_projection(self):
+        """Fit the PCA projection on the cached embeddings and re-project them."""
+        size = len(self._responses)
+        n_components = min(self.n_components, size, self._matrix.shape[1])
+        raw = self._matrix[:size]
+        mean = raw.mean(axis=0)
+        _, _, vt = np.linalg.svd(raw - mean, full_matrices=False)
+        self._mean = mean
+        self._components = np.ascontiguousarray(vt[:n_components], dtype=np.float32)
+        
+        projected = (raw - mean) @ self._components.T
+        norms = np.linalg.norm(projected, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        self._matrix = np.zeros((self.max_entries, n_components), dtype=np.float32)
+        self._matrix[:size] = projected / norms
+        logger.info(
+            f"Fitted semantic cache projection for {self.namespace} "
+            f"({raw.shape[1]} -> {n_components} dims)"
+        )
+    
+    def lookup(
+        self,
+        message: str,
+        tau: Optional[float] = None,
+        context: str = "",
+        context_key: str = ""
+    ) -> Optional[str]:
+        """Find a cached response for a semantically similar message.
+        
+        Args:
+            message (str): The user message
+            tau (Optional[float]): Minimum cosine similarity for a hit, defaults
+                to the threshold for the current embedding space
+            context (str): Text of the turns preceding the message
+            context_key (str): Key of the user turns preceding the message
+                
+        Returns:
+            Optional[str]: The cached response, or None on a miss
+        """
+        try:
+            vector = embed(_embedding_text(message, context))
+            if vector is None:
+                return None
+                
+            with self._lock:
+                size = len(self._responses)
+                if size == 0:
+                    return None
+                    
+                # Rows are unit vectors, so the dot product is the cosine similarity
+                query = self._project(vector)
+                scores = self._matrix[:size] @ query
+                candidates = np.flatnonzero(scores >= (self.threshold if tau is None else tau))
+                
+                # Take the best candidate cached under the same context
+                row = next(
+                    (
+                        int(row) for row in candidates[np.argsort(-scores[candidates])]
+                        if self._contexts[int(row)] == context_key
+                    ),
+                    None
+                )
+                if row is None:
+                    return None
+                    
+                self._responses.move_to_end(row)
+                self._hits[row] += 1
+                logger.debug(f"Semantic cache hit in {self.namespace} (score={scores[row]:.3f})")
+                return self._responses[row]
+        except Exception as e:
+            logger.warning(f"Semantic cache lookup failed: {str(e)}")
+            return None
+    
+    def insert(self, message: str, response: str, context: str = "", context_key: str = ""):
+        """Cache a response, evicting the least recently used entry when full.
+        
+        Args:
+            message (str): The user message
+            response (str): The agent's response
+            context (str): Text of the turns preceding the message
+            context_key (str): Key of the user turns preceding the message
+        """
+        try:
+            vector = embed(_embedding_text(message, context))
+            if vector is None:
+                return
+                
+            with self._lock:
+                if self._matrix is None:
+                    self._matrix = np.zeros((self.max_entries, vector.shape[0]), dtype=np.float32)
+                    
+                if len(self._responses) < self.max_entries:
+                    row = len(self._responses)
+                else:
+                    row, _ = self._responses.popitem(last=False)
+                    
+                self._matrix[row] = self._project(vector)
+                self._responses[row] = response
+                self._contexts[row] = context_key
+                self._keys[row] = _digest(f"{context_key}\0{message}")
+                self._hits[row] = 0
+                self._inserts += 1
+                
+                if self._components is None and self._inserts >= self.fit_size:
+                    self._fit_projection()
+        except Exception as e:
+            logger.warning(f"Failed to insert into semantic cache: {str(e)}")
+    
+    def top_entries(self, limit: int) -> Optional[Dict[str, np.ndarray]]:
+        """Copy out the most frequently hit entries.
+        
+        Args:
+            limit (int): Maximum number of entries to return
+            
+        Returns:
+            Optional[Dict[str, np.ndarray]]: Entry arrays, or None if no entry has been hit
+        """
+        with self._lock:
+            rows = sorted(
+                (row for row in self._responses if self._hits[row] > 0),
+                key=self._hits.get,
+                reverse=True
+            )[:limit]
+            if not rows:
+                return None
+                
+            entries = {
+                "keys": np.array([self._keys[row] for row in rows], dtype="U32"),
+                "hits": np.array([self._hits[row] for row in rows], dtype=np.int64),
+                "vectors": self._matrix[rows].copy(),
+                "responses": np.array([self._responses[row] for row in rows]),
+                "contexts": np.array([self._contexts[row] for row in rows], dtype="U32"),
+            }
+            if self._components is not None:
+                entries["mean"] = self._mean.copy()
+                entries["components"] = self._components.copy()
+            return entries
+    
+    def persist(self, limit: int = settings.SEMANTIC_CACHE_PERSIST_SIZE):
+        """Promote the most frequently hit entries to the long-term store.
+        
+        Args:
+            limit (int): Maximum number of entries to promote
+        """
+        if self.store is None:
+            return
+        entries = self.top_entries(limit)
+        if entries is not None:
+            self.store.upsert(entries)
+    
+    def preload(self):
+        """Warm an empty cache with the entries held in the long-term store."""
+        if self.store is None:
+            return
+        stored = self.store.load()
+        if stored is None:
+            return
+            
+        with self._lock:
+            if self._responses:
+                return
+                
+            count = min(len(stored["keys"]), self.max_entries)
+            if "components" in stored:
+                self._mean = stored["mean"]
+                self._components = stored["components"]
+            self._matrix = np.zeros((self.max_entries, stored["vectors"].shape[1]), dtype=np.float32)
+            self._matrix[:count] = stored["vectors"][:count]
+            # Entries are stored most frequently hit first, so load them in
+            # reverse to leave the hottest ones most recently used
+            for row in reversed(range(count)):
+                self._responses[row] = str(stored["responses"][row])
+                self._contexts[row] = str(stored["contexts"][row]) if "contexts" in stored else ""
+                self._keys[row] = str(stored["keys"][row])
+                self._hits[row] = int(stored["hits"][row])
+            logger.info(f"Preloaded {count} semantic cache entries for {self.namespace}")
+    
+    def clear(self):
+        """Remove all cached entries."""
+        with self._lock:
+            self._responses.clear()
+            self._contexts.clear()
+            self._keys.clear()
+            self._hits.clear()
@@ -1,24 +1,51 @@
+from collections import OrderedDict
 from datetime import datetime, timedelta, UTC
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Optional, Dict, Any, Mapping, Tuple
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from pydantic import BaseModel
+import hashlib
 import logging
+import time
 from .config import get_settings
 from .exceptions import AuthenticationError
 
 logger = logging.getLogger(__name__)
-settings = get_settings()
 
-# Security configuration
-SECRET_KEY = settings.SECRET_KEY
+# Security configuration (the secret key is read from settings when used)
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Verified tokens, keyed by (token, secret key, algorithm) so rotating either
+# misses the cache; values are (token data, expiry as a Unix timestamp)
+_TOKEN_CACHE: "OrderedDict[Tuple[str, str, str], Tuple[TokenData, int]]" = OrderedDict()
+_TOKEN_CACHE_SIZE = 10_000
+
+# API keys for testing, keyed by the SHA-256 digest of the key so plaintext
+# keys are never compared; not accepted in production, where keys are
+# configured through Settings.API_KEY_HASHES
+_TEST_API_KEYS: Mapping[bytes, Mapping[str, str]] = MappingProxyType({
+    hashlib.sha256(key.encode()).digest(): MappingProxyType(data)
+    for key, data in (
+        ("test_free_key", {"tier": "free", "scope": "agents:read"}),
+        ("test_pro_key", {"tier": "pro", "scope": "agents:*"}),
+        ("test_enterprise_key", {"tier": "enterprise", "scope": "agents:*"})
+    )
+})
+
+# Verified API keys, keyed by the raw key; values are (the accepted key set
+# the key was found in, key data) so reloading the key set misses the cache
+_API_KEY_CACHE: "OrderedDict[str, Tuple[Mapping[bytes, Mapping[str, str]], Mapping[str, str]]]" = OrderedDict()
+_API_KEY_CACHE_SIZE = 1024
+
+# Password hashing: argon2 for new hashes, bcrypt hashes still verify and
+# are upgraded on the next successful login. Only the login path hashes
+# passwords; authenticated requests verify the JWT alone.
+pwd_context = CryptContext(schemes=["argon2", "bcrypt"], deprecated="auto")
 
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
@@ -35,7 +62,31 @@ class TokenData(BaseModel):
     api_key: str
     tier: str
     scope: str
-    exp: datetime
+    exp: int  # Expiry as a Unix timestamp
+
+def hash_password(password: str) -> str:
+    """Hash a password with the preferred scheme.
+    
+    Args:
+        password: The plain text password
+        
+    Returns:
+        str: The password hash
+    """
+    return pwd_context.hash(password)
+
+def verify_password(password: str, password_hash: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password at login, upgrading outdated hashes.
+    
+    Args:
+        password: The plain text password
+        password_hash: The stored password hash
+        
+    Returns:
+        Tuple of whether the password matched and, if the stored hash uses
+        a deprecated scheme, a replacement hash to store
+    """
+    return pwd_context.verify_and_update(password, password_hash)
 
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token.
@@ -47,17 +98,15 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
     Returns:
         str: Encoded JWT token
     """
-    to_encode = data.copy()
-    
     if expires_delta:
         expire = datetime.now(UTC) + expires_delta
     else:
         expire = datetime.now(UTC) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
         
-    to_encode.update({"exp": expire})
+    to_encode = {**data, "exp": expire}
     
     try:
-        encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+        encoded_jwt = jwt.encode(to_encode, get_settings().SECRET_KEY, algorithm=ALGORITHM)
         return encoded_jwt
     except Exception as e:
         logger.error(f"Error creating access token: {str(e)}")
@@ -75,17 +124,28 @@ def verify_token(token: str) -> TokenData:
     Raises:
         AuthenticationError: If token is invalid or expired
     """
+    secret_key = get_settings().SECRET_KEY
+    cache_key = (token, secret_key, ALGORITHM)
+    cached = _TOKEN_CACHE.get(cache_key)
+    if cached is not None:
+        if cached[1] > time.time():
+            _TOKEN_CACHE.move_to_end(cache_key)
+            return cached[0]
+        del _TOKEN_CACHE[cache_key]
+        logger.error("JWT verification failed: Signature has expired.")
+        raise AuthenticationError("Invalid or expired token")
+        
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, secret_key, algorithms=[ALGORITHM])
         api_key: str = payload.get("api_key")
         tier: str = payload.get("tier")
         scope: str = payload.get("scope")
-        exp: datetime = datetime.fromtimestamp(payload.get("exp"), UTC)
+        exp: int = payload.get("exp")
         
-        if api_key is None or tier is None:
+        if api_key is None or tier is None or exp is None:
             raise AuthenticationError("Invalid token contents")
             
-        return TokenData(
+        token_data = TokenData(
             api_key=api_key,
             tier=tier,
             scope=scope,
@@ -98,31 +158,57 @@ def verify_token(token: str) -> TokenData:
     except Exception as e:
         logger.error(f"Error verifying token: {str(e)}")
         raise AuthenticationError("Token verification failed")
+        
+    _TOKEN_CACHE[cache_key] = (token_data, exp)
+    if len(_TOKEN_CACHE) > _TOKEN_CACHE_SIZE:
+        _TOKEN_CACHE.popitem(last=False)
+    return token_data
+
+@lru_cache(maxsize=1)
+def _api_keys() -> Mapping[bytes, Mapping[str, str]]:
+    """Get the accepted API keys for the current environment.
+    
+    Configured keys are accepted everywhere; the test keys are added outside
+    production. Clear the cache after changing the configured keys.
+    """
+    settings = get_settings()
+    api_keys = {
+        bytes.fromhex(digest): MappingProxyType({
+            "tier": tier,
+            "scope": settings.API_KEY_TIERS[tier]["scope"]
+        })
+        for digest, tier in settings.API_KEY_HASHES.items()
+    }
+    if settings.APP_ENV != "production":
+        api_keys = {**_TEST_API_KEYS, **api_keys}
+    return MappingProxyType(api_keys)
 
-def verify_api_key(api_key: str) -> Dict[str, Any]:
+def verify_api_key(api_key: str) -> Mapping[str, str]:
     """Verify an API key and return associated data.
     
     Args:
         api_key: The API key to verify
         
     Returns:
-        Dict containing API key data (tier, scope, etc.)
+        Mapping containing API key data (tier, scope, etc.)
         
     Raises:
         AuthenticationError: If API key is invalid
     """
-    # TODO: Implement proper API key verification against database
-    # For now, use a simple mapping for testing
-    api_keys = {
-        "test_free_key": {"tier": "free", "scope": "agents:read"},
-        "test_pro_key": {"tier": "pro", "scope": "agents:*"},
-        "test_enterprise_key": {"tier": "enterprise", "scope": "agents:*"}
-    }
-    
-    if api_key not in api_keys:
+    api_keys = _api_keys()
+    cached = _API_KEY_CACHE.get(api_key)
+    if cached is not None and cached[0] is api_keys:
+        _API_KEY_CACHE.move_to_end(api_key)
+        return cached[1]
+        
+    api_key_data = api_keys.get(hashlib.sha256(api_key.encode()).digest())
+    if api_key_data is None:
         raise AuthenticationError("Invalid API key")
         
-    return api_keys[api_key]
+    _API_KEY_CACHE[api_key] = (api_keys, api_key_data)
+    if len(_API_KEY_CACHE) > _API_KEY_CACHE_SIZE:
+        _API_KEY_CACHE.popitem(last=False)
+    return api_key_data
 
 async def get_current_token(token: str = Depends(oauth2_scheme)) -> TokenData:
     """Dependency for getting current token data.
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from pydantic import ConfigDict, Field, validator, AnyHttpUrl
+from pydantic import ConfigDict, Field, PrivateAttr, validator, AnyHttpUrl
 from typing import List, Dict, Any, Optional, Union
 from functools import lru_cache
 import os
@@ -101,6 +101,10 @@ class Settings(BaseSettings):
         },
         description="API key tiers configuration"
     )
+    API_KEY_HASHES: Dict[str, str] = Field(
+        default_factory=dict,
+        description="Accepted API keys as SHA-256 hex digests of the key mapped to their tier"
+    )
     
     # Rate limiting configuration
     RATE_LIMIT_ENABLED: bool = Field(
@@ -143,6 +147,35 @@ class Settings(BaseSettings):
         ge=1,
         description="Maximum output tokens for model generation"
     )
+    GEMINI_BATCH_MAX_SIZE: int = Field(
+        16,
+        ge=1,
+        description="Maximum number of Gemini requests flushed together"
+    )
+    GEMINI_BATCH_MAX_WAIT_MS: int = Field(
+        0,
+        ge=0,
+        description="Time window in milliseconds for coalescing Gemini requests, 0 to dispatch immediately"
+    )
+    GEMINI_MAX_CONCURRENCY: int = Field(
+        8,
+        ge=1,
+        description="Maximum number of in-flight Gemini requests"
+    )
+    GEMINI_REQUESTS_PER_MINUTE: int = Field(
+        0,
+        ge=0,
+        description="Client-side rate limit for Gemini requests, 0 for no limit"
+    )
+    GEMINI_WARM_CONNECTION: bool = Field(
+        True,
+        description="Open the Gemini connection at startup instead of on the first request"
+    )
+    GEMINI_CONNECT_TIMEOUT: float = Field(
+        5.0,
+        ge=0.0,
+        description="Seconds to wait for the Gemini connection when warming it at startup"
+    )
     
     # Safety settings
     SAFETY_SETTINGS: List[Dict[str, str]] = Field(
@@ -167,6 +200,68 @@ class Settings(BaseSettings):
         description="Safety settings for content filtering"
     )
     
+    # Agent configuration
+    MAX_HISTORY_TURNS: int = Field(
+        64,
+        ge=1,
+        description="Maximum number of messages kept in an agent's conversation history"
+    )
+    
+    # Semantic cache configuration
+    SEMANTIC_CACHE_ENABLED: bool = Field(
+        True,
+        description="Enable/disable the semantic response cache"
+    )
+    SEMANTIC_CACHE_MODEL: str = Field(
+        "all-MiniLM-L6-v2",
+        description="Sentence-transformers model used to embed cached prompts"
+    )
+    SEMANTIC_CACHE_THRESHOLD: float = Field(
+        0.87,
+        ge=0.0,
+        le=1.0,
+        description="Minimum cosine similarity for a semantic cache hit"
+    )
+    SEMANTIC_CACHE_MAX_ENTRIES: int = Field(
+        1024,
+        ge=1,
+        description="Maximum number of entries per agent semantic cache"
+    )
+    SEMANTIC_CACHE_PCA_COMPONENTS: int = Field(
+        64,
+        ge=1,
+        description="Dimensions cached embeddings are projected to once PCA is fitted"
+    )
+    SEMANTIC_CACHE_PCA_FIT_SIZE: int = Field(
+        512,
+        ge=1,
+        description="Number of inserts collected before fitting the PCA projection"
+    )
+    SEMANTIC_CACHE_PCA_THRESHOLD: float = Field(
+        0.90,
+        ge=0.0,
+        le=1.0,
+        description="Minimum cosine similarity for a hit in the projected space"
+    )
+    SEMANTIC_CACHE_PERSIST_ENABLED: bool = Field(
+        True,
+        description="Enable/disable persisting frequently hit semantic cache entries"
+    )
+    SEMANTIC_CACHE_STORE_DIR: str = Field(
+        "cache/semantic",
+        description="Directory holding the persisted semantic cache entries"
+    )
+    SEMANTIC_CACHE_PERSIST_INTERVAL: int = Field(
+        50,
+        ge=1,
+        description="Number of semantic cache inserts between persists"
+    )
+    SEMANTIC_CACHE_PERSIST_SIZE: int = Field(
+        128,
+        ge=1,
+        description="Maximum number of entries promoted to the store per persist"
+    )
+    
     # Database configuration
     DB_HOST: str = Field(
         "localhost",
@@ -203,6 +298,23 @@ class Settings(BaseSettings):
         description="Logging format"
     )
     
+    # Database URL, built once from the DB_* fields
+    _database_url: str = PrivateAttr("")
+    
+    def model_post_init(self, __context: Any) -> None:
+        """Build derived values once the settings have been validated."""
+        self._database_url = self._build_database_url()
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Set a field, keeping the cached database URL in sync."""
+        super().__setattr__(name, value)
+        if name.startswith("DB_"):
+            self._database_url = self._build_database_url()
+    
+    def _build_database_url(self) -> str:
+        """Build the database URL from the DB_* fields."""
+        return f"postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+    
     @property
     def DATABASE_URL(self) -> str:
         """Get the database URL.
@@ -210,7 +322,7 @@ class Settings(BaseSettings):
         Returns:
             str: Database connection URL
         """
-        return f"postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+        return self._database_url
     
     @validator("CORS_ORIGINS", pre=True)
     def assemble_cors_origins(cls, v: Union[str, List[str]]) -> List[str]:
@@ -226,6 +338,27 @@ class Settings(BaseSettings):
             return [i.strip() for i in v.split(",")]
         return v
     
+    @validator("API_KEY_HASHES")
+    def validate_api_key_hashes(cls, v: Dict[str, str], values: Dict[str, Any]) -> Dict[str, str]:
+        """Validate the API key digests and their tiers.
+        
+        Args:
+            v: API key digests mapped to tiers
+            values: Settings values
+            
+        Returns:
+            Dict[str, str]: API key digests, lowercased, mapped to tiers
+        """
+        tiers = values.get("API_KEY_TIERS", {})
+        hashes = {}
+        for digest, tier in v.items():
+            if len(digest) != 64 or not all(c in "0123456789abcdefABCDEF" for c in digest):
+                raise ValueError("API key hashes must be SHA-256 hex digests")
+            if tier not in tiers:
+                raise ValueError(f"Unknown API key tier: {tier}")
+            hashes[digest.lower()] = tier
+        return hashes
+    
     @validator("RATE_LIMIT_TIERS", always=True)
     def set_rate_limit_tiers(cls, v: Dict[str, Dict[str, Any]], values: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
         """Set rate limit tiers from API key tiers.
@@ -251,7 +384,7 @@ class Settings(BaseSettings):
         validate_assignment=True  # Validate values on assignment
     )
 
-@lru_cache()
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """Get cached settings instance.
     
@@ -1,4 +1,4 @@
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, Tuple
 
 class BaseCustomException(Exception):
     """Base exception class for all custom exceptions."""
@@ -67,6 +67,29 @@ class NetworkError(BaseCustomException):
     """Raised when network operations fail."""
     pass
 
+# Error response per exception class: (error type, message, status code).
+# A message of None means the exception's own message is used.
+_ERROR_TABLE: Dict[type, Tuple[str, Optional[str], int]] = {
+    GeminiSafetyError: (
+        "GEMINI_SAFETY_ERROR",
+        "The request was blocked by Gemini's safety filters. Please rephrase your message.",
+        400
+    ),
+    GeminiQuotaError: ("GEMINI_QUOTA_ERROR", "API quota exceeded. Please try again later.", 429),
+    GeminiInvalidRequestError: ("GEMINI_INVALID_REQUEST", "Invalid request to Gemini API.", 400),
+    GeminiUnavailableError: (
+        "GEMINI_UNAVAILABLE",
+        "Gemini API service is currently unavailable. Please try again later.",
+        503
+    ),
+    ContentBlockedError: ("CONTENT_BLOCKED", None, 400),
+    ContentGenerationError: ("GENERATION_FAILED", None, 500),
+    RateLimitError: ("RATE_LIMIT_EXCEEDED", None, 429),
+    AuthenticationError: ("AUTHENTICATION_FAILED", None, 401),
+    ValidationError: ("VALIDATION_FAILED", None, 400),
+    ConfigurationError: ("CONFIGURATION_ERROR", None, 500),
+}
+
 def handle_agent_error(error: Exception) -> Dict[str, Any]:
     """Convert various exceptions to standardized error responses.
     
@@ -76,80 +99,21 @@ def handle_agent_error(error: Exception) -> Dict[str, Any]:
     Returns:
         Dict containing error details in a standardized format
     """
-    if isinstance(error, GeminiSafetyError):
-        return {
-            "error_type": "GEMINI_SAFETY_ERROR",
-            "message": "The request was blocked by Gemini's safety filters. Please rephrase your message.",
-            "details": error.details,
-            "status_code": 400
-        }
-    elif isinstance(error, GeminiQuotaError):
-        return {
-            "error_type": "GEMINI_QUOTA_ERROR",
-            "message": "API quota exceeded. Please try again later.",
-            "details": error.details,
-            "status_code": 429
-        }
-    elif isinstance(error, GeminiInvalidRequestError):
-        return {
-            "error_type": "GEMINI_INVALID_REQUEST",
-            "message": "Invalid request to Gemini API.",
-            "details": error.details,
-            "status_code": 400
-        }
-    elif isinstance(error, GeminiUnavailableError):
-        return {
-            "error_type": "GEMINI_UNAVAILABLE",
-            "message": "Gemini API service is currently unavailable. Please try again later.",
-            "details": error.details,
-            "status_code": 503
-        }
-    elif isinstance(error, ContentBlockedError):
-        return {
-            "error_type": "CONTENT_BLOCKED",
-            "message": str(error),
-            "details": error.details,
-            "status_code": 400
-        }
-    elif isinstance(error, ContentGenerationError):
-        return {
-            "error_type": "GENERATION_FAILED",
-            "message": str(error),
-            "details": error.details,
-            "status_code": 500
-        }
-    elif isinstance(error, RateLimitError):
-        return {
-            "error_type": "RATE_LIMIT_EXCEEDED",
-            "message": str(error),
-            "details": error.details,
-            "status_code": 429
-        }
-    elif isinstance(error, AuthenticationError):
-        return {
-            "error_type": "AUTHENTICATION_FAILED",
-            "message": str(error),
-            "details": error.details,
-            "status_code": 401
-        }
-    elif isinstance(error, ValidationError):
-        return {
-            "error_type": "VALIDATION_FAILED",
-            "message": str(error),
-            "details": error.details,
-            "status_code": 400
-        }
-    elif isinstance(error, ConfigurationError):
-        return {
-            "error_type": "CONFIGURATION_ERROR",
-            "message": str(error),
-            "details": error.details,
-            "status_code": 500
-        }
-    else:
-        return {
-            "error_type": "INTERNAL_SERVER_ERROR",
-            "message": "An unexpected error occurred",
-            "details": {"original_error": str(error)},
-            "status_code": 500
-        } 
\ No newline at end of file
+    # Use the entry of the most specific class in the exception's hierarchy
+    for cls in type(error).__mro__:
+        spec = _ERROR_TABLE.get(cls)
+        if spec is not None:
+            error_type, message, status_code = spec
+            return {
+                "error_type": error_type,
+                "message": str(error) if message is None else message,
+                "details": error.details,
+                "status_code": status_code
+            }
+            
+    return {
+        "error_type": "INTERNAL_SERVER_ERROR",
+        "message": "An unexpected error occurred",
+        "details": {"original_error": str(error)},
+        "status_code": 500
+    }
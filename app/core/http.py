@@ -0,0 +1,35 @@
+from google.generativeai import client as genai_client
+import asyncio
+import logging
+from .config import get_settings
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+async def warm_gemini_channel(timeout: float = settings.GEMINI_CONNECT_TIMEOUT) -> bool:
+    """Open the shared Gemini connection before the first request needs it.
+    
+    All agents call Gemini through the client library's process-wide async
+    gRPC channel, which multiplexes concurrent requests over one HTTP/2
+    connection. The channel connects lazily, so without warming it the first
+    requests after startup also pay for DNS, TCP and TLS setup.
+    
+    Must be called from the event loop that will serve requests, since the
+    channel is bound to the loop it is created in.
+    
+    Args:
+        timeout (float): Seconds to wait for the channel to become ready
+        
+    Returns:
+        bool: True if the channel is ready
+    """
+    try:
+        channel = genai_client.get_default_generative_async_client().transport.grpc_channel
+        await asyncio.wait_for(channel.channel_ready(), timeout)
+        logger.info("Gemini channel ready")
+        return True
+    except Exception as e:
+        logger.warning(f"Failed to warm Gemini channel, connecting on first request: {str(e)}")
+        return False
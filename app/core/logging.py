@@ -1,27 +1,58 @@
 import logging
 import logging.handlers
+import atexit
+import copy
+import inspect
 import json
+import queue
 import sys
 import time
 from datetime import datetime, UTC
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
 from functools import wraps
-import traceback
 from .config import get_settings
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 settings = get_settings()
 
 # Create logs directory if it doesn't exist
 LOGS_DIR = Path("logs")
 LOGS_DIR.mkdir(exist_ok=True)
 
+def _json_default(obj: Any) -> Any:
+    """Serialize values the JSON encoder does not handle natively."""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    return str(obj)
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+    
+    def _dumps(data: Dict[str, Any]) -> str:
+        """Serialize a log entry to JSON with orjson."""
+        return orjson.dumps(data, default=_json_default, option=_ORJSON_OPTIONS).decode()
+else:
+    def _dumps(data: Dict[str, Any]) -> str:
+        """Serialize a log entry to JSON with the standard library."""
+        return json.dumps(data, default=_json_default)
+
 class JSONFormatter(logging.Formatter):
     """Custom JSON formatter for structured logging."""
     
     def __init__(self, **kwargs):
         super().__init__()
         self.extras = kwargs
+        
+        # The extras are the same for every record, so encode them once as a
+        # JSON fragment and splice it into each entry
+        self._extras_keys = frozenset(kwargs)
+        self._extras_json = _dumps(kwargs)[1:-1]
     
     def format(self, record: logging.LogRecord) -> str:
         """Format log record as JSON.
@@ -33,7 +64,7 @@ class JSONFormatter(logging.Formatter):
             str: JSON formatted log entry
         """
         log_data = {
-            "timestamp": datetime.now(UTC).isoformat(),
+            "timestamp": datetime.now(UTC),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -41,34 +72,54 @@ class JSONFormatter(logging.Formatter):
             "function": record.funcName,
             "line": record.lineno,
             "process_id": record.process,
-            "thread_id": record.thread,
-            **self.extras
+            "thread_id": record.thread
         }
         
+        # Fields attached to the record take precedence over the extras
+        overrides = {}
+        
         # Add exception info if present
         if record.exc_info:
-            log_data["exception"] = {
+            # Rendered once per record and shared with the other handlers'
+            # formatters, as logging.Formatter does
+            if not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+            overrides["exception"] = {
                 "type": record.exc_info[0].__name__,
                 "message": str(record.exc_info[1]),
-                "traceback": traceback.format_exception(*record.exc_info)
+                "traceback": record.exc_text
             }
             
         # Add custom fields if present
         if hasattr(record, "extra_fields"):
-            log_data.update(record.extra_fields)
+            overrides.update(record.extra_fields)
             
         # Add context from LoggerAdapter
         if hasattr(record, "context"):
-            log_data.update(record.context)
+            overrides.update(record.context)
             
-        return json.dumps(log_data)
+        log_data.update(overrides)
+        if not self._extras_json:
+            return _dumps(log_data)
+        if self._extras_keys.isdisjoint(log_data):
+            return f"{_dumps(log_data)[:-1]},{self._extras_json}}}"
+            
+        # A field shadows one of the extras, so merge them in precedence order
+        return _dumps({**log_data, **self.extras, **overrides})
+
+def _format_context(context: Any) -> str:
+    """Render log context as the prefix used by StandardFormatter."""
+    if isinstance(context, Mapping):
+        context_str = " ".join(f"{k}={v}" for k, v in context.items())
+        return f"[{context_str}] " if context_str else ""
+    return str(context)
 
 class StandardFormatter(logging.Formatter):
     """Standard formatter for human-readable logs."""
     
     def __init__(self):
         super().__init__(
-            fmt="%(asctime)s - %(name)s - %(levelname)s - %(context)s%(message)s",
+            fmt="%(asctime)s - %(name)s - %(levelname)s - %(context_prefix)s%(message)s",
             datefmt="%Y-%m-%d %H:%M:%S"
         )
     
@@ -81,22 +132,48 @@ class StandardFormatter(logging.Formatter):
         Returns:
             str: Formatted log message
         """
-        # Add context string if present
-        if hasattr(record, "context"):
-            context = record.context
-            if isinstance(context, dict):
-                context_str = " ".join(f"{k}={v}" for k, v in context.items())
-                if context_str:
-                    record.context = f"[{context_str}] "
-                else:
-                    record.context = ""
-            else:
-                record.context = str(context)
-        else:
-            record.context = ""
+        # LoggerAdapter attaches the rendered context; render any other
+        # context passed as an extra field
+        if not hasattr(record, "context_prefix"):
+            record.context_prefix = _format_context(getattr(record, "context", ""))
             
         return super().format(record)
 
+class _LocalQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler for a listener running in the same process.
+    
+    The stock handler formats records before queueing them, flattening the
+    exception info into the message. Records only cross a thread here, so
+    they are queued with the message merged but otherwise intact, and the
+    file handlers' formatters see the same fields as the console handler.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Merge the message arguments into a copy of the record.
+        
+        Args:
+            record: Log record to queue
+            
+        Returns:
+            logging.LogRecord: Record to put on the queue
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+# Listener writing queued records to the log files, replaced on each setup
+_listener: Optional[logging.handlers.QueueListener] = None
+
+def _stop_listener() -> None:
+    """Flush queued records and stop the file writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+atexit.register(_stop_listener)
+
 def setup_logging(
     app_name: str = settings.APP_NAME,
     log_level: str = settings.LOG_LEVEL,
@@ -118,6 +195,7 @@ def setup_logging(
     
     # Clear existing handlers
     root_logger.handlers.clear()
+    _stop_listener()
     
     # Create formatters
     json_formatter = JSONFormatter(app_name=app_name, environment=settings.APP_ENV)
@@ -136,7 +214,6 @@ def setup_logging(
         backupCount=5
     )
     file_handler.setFormatter(formatter)
-    root_logger.addHandler(file_handler)
     
     # Error file handler
     error_handler = logging.handlers.RotatingFileHandler(
@@ -146,11 +223,33 @@ def setup_logging(
     )
     error_handler.setLevel(logging.ERROR)
     error_handler.setFormatter(formatter)
-    root_logger.addHandler(error_handler)
+    
+    # Write log files from a background thread so requests never block on disk
+    global _listener
+    log_queue: queue.Queue = queue.Queue(-1)
+    _listener = logging.handlers.QueueListener(
+        log_queue,
+        file_handler,
+        error_handler,
+        respect_handler_level=True
+    )
+    _listener.start()
+    root_logger.addHandler(_LocalQueueHandler(log_queue))
 
 class LoggerAdapter(logging.LoggerAdapter):
     """Custom logger adapter for adding context to logs."""
     
+    def __init__(self, logger: logging.Logger, extra: Optional[Dict[str, Any]] = None):
+        """Bind the context once so each log call only attaches it by reference.
+        
+        Args:
+            logger: Logger to wrap
+            extra: Context added to every record
+        """
+        super().__init__(logger, extra)
+        self._context = MappingProxyType(dict(extra or {}))
+        self._context_prefix = _format_context(self._context)
+    
     def process(self, msg: str, kwargs: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
         """Process log message with context.
         
@@ -161,12 +260,14 @@ class LoggerAdapter(logging.LoggerAdapter):
         Returns:
             tuple: Processed message and kwargs
         """
-        # Ensure extra dict exists
-        if "extra" not in kwargs:
-            kwargs["extra"] = {}
-        
+        # Nothing to add without context
+        if not self._context:
+            return msg, kwargs
+            
         # Add context to extra
-        kwargs["extra"]["context"] = self.extra
+        extra = kwargs.setdefault("extra", {})
+        extra["context"] = self._context
+        extra["context_prefix"] = self._context_prefix
         
         return msg, kwargs
 
@@ -183,40 +284,99 @@ def get_logger(name: str, **kwargs) -> LoggerAdapter:
     logger = logging.getLogger(name)
     return LoggerAdapter(logger, kwargs)
 
-def log_execution_time(logger: Optional[logging.Logger] = None):
-    """Decorator to log function execution time.
+def _timed(
+    func: Callable,
+    logger: logging.LoggerAdapter,
+    success_message: str,
+    failure_message: str,
+    build_extra: Callable[[float, Optional[Exception]], Dict[str, Any]]
+) -> Callable:
+    """Wrap a function to log its execution time.
+    
+    Sync and async functions get their own wrapper, and messages and extra
+    fields are only built when the logger is enabled for their level.
     
     Args:
-        logger: Logger to use (if None, creates a new one)
+        func: Function to wrap
+        logger: Logger to use
+        success_message: Message template for successful calls
+        failure_message: Message template for failed calls
+        build_extra: Builds the extra fields from the execution time and error
+        
+    Returns:
+        Callable: The wrapped function, or the function itself if nothing
+        would ever be logged
     """
-    def decorator(func):
-        nonlocal logger
-        if logger is None:
-            logger = get_logger(func.__module__)
+    if not logger.isEnabledFor(logging.ERROR):
+        return func
+        
+    name = func.__name__
+    
+    def log_success(execution_time: float) -> None:
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                success_message.format(name=name, execution_time=execution_time),
+                extra=build_extra(execution_time, None),
+                stacklevel=2
+            )
+            
+    def log_failure(execution_time: float, error: Exception) -> None:
+        if logger.isEnabledFor(logging.ERROR):
+            logger.error(
+                failure_message.format(name=name, execution_time=execution_time),
+                exc_info=True,
+                extra=build_extra(execution_time, error),
+                stacklevel=2
+            )
             
+    if inspect.iscoroutinefunction(func):
         @wraps(func)
-        def wrapper(*args, **kwargs):
-            start_time = time.time()
+        async def async_wrapper(*args, **kwargs):
+            start_time = time.perf_counter()
             try:
-                result = func(*args, **kwargs)
-                execution_time = time.time() - start_time
-                logger.info(
-                    f"Function '{func.__name__}' executed in {execution_time:.2f} seconds",
-                    extra={"execution_time": execution_time}
-                )
-                return result
+                result = await func(*args, **kwargs)
             except Exception as e:
-                execution_time = time.time() - start_time
-                logger.error(
-                    f"Function '{func.__name__}' failed after {execution_time:.2f} seconds",
-                    exc_info=True,
-                    extra={
-                        "execution_time": execution_time,
-                        "error_type": type(e).__name__
-                    }
-                )
+                log_failure(time.perf_counter() - start_time, e)
                 raise
-        return wrapper
+            log_success(time.perf_counter() - start_time)
+            return result
+        return async_wrapper
+        
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        start_time = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            log_failure(time.perf_counter() - start_time, e)
+            raise
+        log_success(time.perf_counter() - start_time)
+        return result
+    return wrapper
+
+def _execution_time_extra(execution_time: float, error: Optional[Exception]) -> Dict[str, Any]:
+    """Build the extra fields logged by log_execution_time."""
+    if error is None:
+        return {"execution_time": execution_time}
+    return {
+        "execution_time": execution_time,
+        "error_type": type(error).__name__
+    }
+
+def log_execution_time(logger: Optional[logging.Logger] = None):
+    """Decorator to log function execution time.
+    
+    Args:
+        logger: Logger to use (if None, creates a new one)
+    """
+    def decorator(func):
+        return _timed(
+            func,
+            logger or get_logger(func.__module__),
+            "Function '{name}' executed in {execution_time:.2f} seconds",
+            "Function '{name}' failed after {execution_time:.2f} seconds",
+            _execution_time_extra
+        )
     return decorator
 
 def monitor_api_call(logger: Optional[logging.Logger] = None):
@@ -226,39 +386,29 @@ def monitor_api_call(logger: Optional[logging.Logger] = None):
         logger: Logger to use (if None, creates a new one)
     """
     def decorator(func):
-        nonlocal logger
-        if logger is None:
-            logger = get_logger(func.__module__)
+        api_call = func.__name__
+        
+        # Extra fields with the call name filled in; only the timing and
+        # error type change between calls
+        success_extra = {"api_call": api_call, "execution_time": 0.0, "status": "success"}
+        failure_extra = {"api_call": api_call, "execution_time": 0.0, "status": "error"}
+        
+        def build_extra(execution_time: float, error: Optional[Exception]) -> Dict[str, Any]:
+            if error is None:
+                extra = success_extra.copy()
+            else:
+                extra = failure_extra.copy()
+                extra["error_type"] = type(error).__name__
+            extra["execution_time"] = execution_time
+            return extra
             
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            start_time = time.time()
-            try:
-                result = func(*args, **kwargs)
-                execution_time = time.time() - start_time
-                logger.info(
-                    f"API call to '{func.__name__}' successful",
-                    extra={
-                        "api_call": func.__name__,
-                        "execution_time": execution_time,
-                        "status": "success"
-                    }
-                )
-                return result
-            except Exception as e:
-                execution_time = time.time() - start_time
-                logger.error(
-                    f"API call to '{func.__name__}' failed",
-                    exc_info=True,
-                    extra={
-                        "api_call": func.__name__,
-                        "execution_time": execution_time,
-                        "status": "error",
-                        "error_type": type(e).__name__
-                    }
-                )
-                raise
-        return wrapper
+        return _timed(
+            func,
+            logger or get_logger(func.__module__),
+            "API call to '{name}' successful",
+            "API call to '{name}' failed",
+            build_extra
+        )
     return decorator
 
 # Initialize logging when module is imported
@@ -7,6 +7,12 @@ from .exceptions import RateLimitError, handle_agent_error
 
 logger = logging.getLogger(__name__)
 
+# Rate limit response headers
+_LIMIT_MINUTE_HEADER = "X-RateLimit-Limit-Minute"
+_REMAINING_MINUTE_HEADER = "X-RateLimit-Remaining-Minute"
+_LIMIT_HOUR_HEADER = "X-RateLimit-Limit-Hour"
+_REMAINING_HOUR_HEADER = "X-RateLimit-Remaining-Hour"
+
 class RateLimitMiddleware(BaseHTTPMiddleware):
     """Middleware for applying rate limits to API requests."""
     
@@ -30,20 +36,28 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             # Get client tier (from API key or default to free)
             tier = self._get_client_tier(request)
             
-            # Check rate limit
-            rate_limiter.check_rate_limit(client_id, tier)
+            # Check rate limit and get remaining quota in one pass
+            minute_remaining, hour_remaining = rate_limiter.check_and_get_quota(client_id, tier)
             
-            # Get remaining quota
-            quota = rate_limiter.get_remaining_quota(client_id, tier)
+            # Let endpoints that do more than one request's work charge the rest
+            request.state.rate_limit_client = (client_id, tier)
             
             # Process the request
             response = await call_next(request)
             
-            # Add rate limit headers to response
-            response.headers["X-RateLimit-Limit-Minute"] = str(rate_limiter.limits[tier]["requests_per_minute"])
-            response.headers["X-RateLimit-Remaining-Minute"] = str(quota["requests_per_minute_remaining"])
-            response.headers["X-RateLimit-Limit-Hour"] = str(rate_limiter.limits[tier]["requests_per_hour"])
-            response.headers["X-RateLimit-Remaining-Hour"] = str(quota["requests_per_hour_remaining"])
+            # Add rate limit headers to response, with the quota left after
+            # any extra charge made by the endpoint
+            minute_remaining, hour_remaining = getattr(
+                request.state,
+                "rate_limit_remaining",
+                (minute_remaining, hour_remaining)
+            )
+            limit_strs = rate_limiter.limit_strs[tier]
+            headers = response.headers
+            headers[_LIMIT_MINUTE_HEADER] = limit_strs["minute"]
+            headers[_REMAINING_MINUTE_HEADER] = str(minute_remaining)
+            headers[_LIMIT_HOUR_HEADER] = limit_strs["hour"]
+            headers[_REMAINING_HOUR_HEADER] = str(hour_remaining)
             
             return response
             
@@ -1,15 +1,25 @@
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timedelta, UTC
+from operator import itemgetter
 from typing import Dict, List, Optional, Any
+import os
 import time
 import threading
-from collections import defaultdict, deque
-import json
+from collections import deque
 from pathlib import Path
 from functools import wraps
+import gzip
+import orjson
 from .logging import get_logger
 
 logger = get_logger(__name__)
 
+# Key of the epoch timestamp in a stored (timestamp, metric data) pair
+_TIMESTAMP = itemgetter(0)
+
+# Metric timestamps are stored as datetimes and written as RFC 3339 strings
+_ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NAIVE_UTC
+
 class MetricsCollector:
     """Collector for application metrics."""
     
@@ -18,12 +28,15 @@ class MetricsCollector:
         self.metrics_dir = Path("metrics")
         self.metrics_dir.mkdir(exist_ok=True)
         
-        # Initialize metrics storage
-        self._metrics: Dict[str, deque] = defaultdict(
-            lambda: deque(maxlen=max_history)
-        )
+        # Initialize metrics storage: (epoch timestamp, metric data) pairs in
+        # timestamp order, so time ranges can be found by binary search
+        self._metrics: Dict[str, deque] = {}
         self._metrics_lock = threading.Lock()
         
+        # Last entry written per metric, so each write only covers what was
+        # recorded since the previous one
+        self._last_written: Dict[str, tuple] = {}
+        
         # Start background metrics writer
         self._should_run = True
         self._writer_thread = threading.Thread(
@@ -45,15 +58,22 @@ class MetricsCollector:
             value: Metric value
             tags: Optional tags for the metric
         """
-        timestamp = datetime.now(UTC).isoformat()
-        metric_data = {
-            "timestamp": timestamp,
-            "value": value,
-            "tags": tags or {}
-        }
-        
         with self._metrics_lock:
-            self._metrics[metric_name].append(metric_data)
+            values = self._metrics.get(metric_name)
+            if values is None:
+                values = self._metrics[metric_name] = deque(maxlen=self.max_history)
+                
+            # Stamped under the lock and never before the previous entry, so
+            # concurrent recording or a wall-clock step back keeps them sorted
+            now = time.time()
+            if values and values[-1][0] > now:
+                now = values[-1][0]
+            metric_data = {
+                "timestamp": datetime.fromtimestamp(now, UTC),
+                "value": value,
+                "tags": tags or {}
+            }
+            values.append((now, metric_data))
     
     def get_metrics(
         self,
@@ -74,29 +94,27 @@ class MetricsCollector:
             List[Dict[str, Any]]: Filtered metrics
         """
         with self._metrics_lock:
-            metrics = list(self._metrics[metric_name])
+            entries = list(self._metrics.get(metric_name, ()))
         
         # Filter by time range
-        if start_time:
-            metrics = [
-                m for m in metrics
-                if datetime.fromisoformat(m["timestamp"]).replace(tzinfo=UTC) >= start_time
-            ]
-        if end_time:
-            metrics = [
-                m for m in metrics
-                if datetime.fromisoformat(m["timestamp"]).replace(tzinfo=UTC) <= end_time
-            ]
+        start = bisect_left(entries, start_time.timestamp(), key=_TIMESTAMP) if start_time else 0
+        end = bisect_right(entries, end_time.timestamp(), key=_TIMESTAMP) if end_time else len(entries)
+        metrics = [metric_data for _, metric_data in entries[start:end]]
         
-        # Filter by tags
+        # Filter by tags. Callers usually pass the same tags dict for every
+        # record of an operation, so each distinct dict is only checked once
         if tags:
-            metrics = [
-                m for m in metrics
-                if all(
-                    m["tags"].get(k) == v
-                    for k, v in tags.items()
-                )
-            ]
+            wanted = tags.items()
+            matches: Dict[int, bool] = {}
+            filtered = []
+            for m in metrics:
+                metric_tags = m["tags"]
+                matched = matches.get(id(metric_tags))
+                if matched is None:
+                    matched = matches[id(metric_tags)] = metric_tags.items() >= wanted
+                if matched:
+                    filtered.append(m)
+            metrics = filtered
         
         return metrics
     
@@ -114,18 +132,48 @@ class MetricsCollector:
             time.sleep(interval)
     
     def _write_metrics_to_disk(self) -> None:
-        """Write current metrics to disk."""
+        """Append the metrics recorded since the last write to the day's log.
+        
+        Each metric record is written as one JSON line tagged with its metric
+        name, so a write costs only the new records rather than a full dump.
+        """
         timestamp = datetime.now(UTC)
-        filename = self.metrics_dir / f"metrics_{timestamp.strftime('%Y%m%d_%H%M%S')}.json"
+        filename = self.metrics_dir / f"metrics_{timestamp.strftime('%Y%m%d')}.jsonl.gz"
         
         with self._metrics_lock:
-            metrics_data = {
-                name: list(values)
-                for name, values in self._metrics.items()
-            }
+            snapshot = [(name, list(values)) for name, values in self._metrics.items()]
+            
+        lines = []
+        for name, entries in snapshot:
+            # Walk back to the last entry written; if it has been evicted from
+            # the history, every entry is new
+            last_written = self._last_written.get(name)
+            start = len(entries)
+            while start and entries[start - 1] is not last_written:
+                start -= 1
+            if start < len(entries):
+                lines.extend(
+                    orjson.dumps({"metric": name, **metric_data}, option=_ORJSON_OPTIONS)
+                    for _, metric_data in entries[start:]
+                )
+                self._last_written[name] = entries[-1]
+                
+        if not lines:
+            return
+            
+        # Each write appends a gzip member, which readers see as one stream.
+        # Metric records are repetitive, so even the fastest level shrinks them a lot
+        member = gzip.compress(b"\n".join(lines) + b"\n", compresslevel=1)
         
-        with open(filename, "w") as f:
-            json.dump(metrics_data, f, indent=2)
+        # Every worker process appends to the same file, so the member goes out
+        # in a single O_APPEND write that cannot interleave with another's
+        fd = os.open(filename, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            written = os.write(fd, member)
+        finally:
+            os.close(fd)
+        if written != len(member):
+            logger.error(f"Short write to {filename}: {written} of {len(member)} bytes")
 
 class PerformanceMonitor:
     """Monitor for tracking performance metrics."""
@@ -147,10 +195,10 @@ class PerformanceMonitor:
         def decorator(func):
             @wraps(func)
             def wrapper(*args, **kwargs):
-                start_time = time.time()
+                start_time = time.monotonic()
                 try:
                     result = func(*args, **kwargs)
-                    execution_time = time.time() - start_time
+                    execution_time = time.monotonic() - start_time
                     self.metrics_collector.record_metric(
                         f"{operation_name}_execution_time",
                         execution_time,
@@ -158,7 +206,7 @@ class PerformanceMonitor:
                     )
                     return result
                 except Exception as e:
-                    execution_time = time.time() - start_time
+                    execution_time = time.monotonic() - start_time
                     self.metrics_collector.record_metric(
                         f"{operation_name}_error",
                         {
@@ -185,10 +233,10 @@ class PerformanceMonitor:
         def decorator(func):
             @wraps(func)
             def wrapper(*args, **kwargs):
-                start_time = time.time()
+                start_time = time.monotonic()
                 try:
                     result = func(*args, **kwargs)
-                    execution_time = time.time() - start_time
+                    execution_time = time.monotonic() - start_time
                     self.metrics_collector.record_metric(
                         "api_request",
                         {
@@ -200,7 +248,7 @@ class PerformanceMonitor:
                     )
                     return result
                 except Exception as e:
-                    execution_time = time.time() - start_time
+                    execution_time = time.monotonic() - start_time
                     self.metrics_collector.record_metric(
                         "api_request",
                         {
@@ -1,4 +1,4 @@
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 import time
 from datetime import datetime
 import logging
@@ -9,6 +9,9 @@ logger = logging.getLogger(__name__)
 class TokenBucket:
     """Token bucket rate limiter implementation."""
     
+    # One bucket is kept per client, tier and period, so skip the per-instance dict
+    __slots__ = ("capacity", "tokens", "fill_rate", "last_update")
+    
     def __init__(self, tokens: int, fill_rate: float):
         """Initialize the token bucket.
         
@@ -19,28 +22,43 @@ class TokenBucket:
         self.capacity = tokens
         self.tokens = tokens
         self.fill_rate = fill_rate
-        self.last_update = time.time()
+        self.last_update = time.monotonic()
     
-    def _refill(self):
-        """Refill tokens based on elapsed time."""
-        now = time.time()
-        delta = now - self.last_update
-        self.tokens = min(self.capacity, self.tokens + delta * self.fill_rate)
+    def _refill(self, now: Optional[float] = None):
+        """Refill tokens based on elapsed time.
+        
+        Args:
+            now (Optional[float]): Current time, read from the clock if not given
+        """
+        if now is None:
+            now = time.monotonic()
+        # A full bucket has nothing to refill
+        if self.tokens < self.capacity:
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_update) * self.fill_rate)
         self.last_update = now
     
-    def consume(self, tokens: int = 1) -> bool:
+    def consume(self, tokens: int = 1, now: Optional[float] = None) -> bool:
         """Attempt to consume tokens from the bucket.
         
         Args:
             tokens (int): Number of tokens to consume
+            now (Optional[float]): Current time, read from the clock if not given
             
         Returns:
             bool: True if tokens were consumed, False otherwise
         """
-        self._refill()
-        if self.tokens >= tokens:
-            self.tokens -= tokens
+        # Same as _refill, inlined since this runs on every request
+        if now is None:
+            now = time.monotonic()
+        available = self.tokens
+        if available < self.capacity:
+            available = min(self.capacity, available + (now - self.last_update) * self.fill_rate)
+        self.last_update = now
+        
+        if available >= tokens:
+            self.tokens = available - tokens
             return True
+        self.tokens = available
         return False
 
 class RateLimiter:
@@ -67,34 +85,43 @@ class RateLimiter:
             }
         }
         
-        # Initialize buckets for each client
-        self.minute_buckets: Dict[str, Dict[str, TokenBucket]] = {}
-        self.hour_buckets: Dict[str, Dict[str, TokenBucket]] = {}
+        # Limits per tier pre-rendered for the rate limit response headers
+        self.limit_strs: Dict[str, Dict[str, str]] = {
+            tier: {
+                "minute": str(limits["requests_per_minute"]),
+                "hour": str(limits["requests_per_hour"])
+            }
+            for tier, limits in self.limits.items()
+        }
+        
+        # Minute and hour buckets for each client and tier
+        self._buckets: Dict[Tuple[str, str], Tuple[TokenBucket, TokenBucket]] = {}
     
-    def _get_or_create_buckets(self, client_id: str, tier: str = "free"):
+    def _get_or_create_buckets(self, client_id: str, tier: str = "free") -> Tuple[TokenBucket, TokenBucket]:
         """Get or create rate limit buckets for a client.
         
         Args:
             client_id (str): The client identifier
             tier (str): The client's service tier
+            
+        Returns:
+            Tuple[TokenBucket, TokenBucket]: The client's minute and hour buckets
         """
-        # Initialize minute bucket if not exists
-        if client_id not in self.minute_buckets:
-            self.minute_buckets[client_id] = {}
-        if tier not in self.minute_buckets[client_id]:
-            self.minute_buckets[client_id][tier] = TokenBucket(
-                self.limits[tier]["requests_per_minute"],
-                self.limits[tier]["requests_per_minute"] / 60.0
-            )
-        
-        # Initialize hour bucket if not exists
-        if client_id not in self.hour_buckets:
-            self.hour_buckets[client_id] = {}
-        if tier not in self.hour_buckets[client_id]:
-            self.hour_buckets[client_id][tier] = TokenBucket(
-                self.limits[tier]["requests_per_hour"],
-                self.limits[tier]["requests_per_hour"] / 3600.0
+        key = (client_id, tier)
+        buckets = self._buckets.get(key)
+        if buckets is None:
+            limits = self.limits[tier]
+            buckets = self._buckets[key] = (
+                TokenBucket(
+                    limits["requests_per_minute"],
+                    limits["requests_per_minute"] / 60.0
+                ),
+                TokenBucket(
+                    limits["requests_per_hour"],
+                    limits["requests_per_hour"] / 3600.0
+                )
             )
+        return buckets
     
     def check_rate_limit(self, client_id: str, tier: str = "free") -> bool:
         """Check if a request is within rate limits.
@@ -110,32 +137,7 @@ class RateLimiter:
             RateLimitError: If rate limit is exceeded
         """
         try:
-            self._get_or_create_buckets(client_id, tier)
-            
-            # Check minute limit
-            minute_bucket = self.minute_buckets[client_id][tier]
-            if not minute_bucket.consume(self.limits[tier]["tokens_per_request"]):
-                raise RateLimitError(
-                    "Rate limit exceeded: Too many requests per minute",
-                    {
-                        "limit": self.limits[tier]["requests_per_minute"],
-                        "period": "minute",
-                        "tier": tier
-                    }
-                )
-            
-            # Check hour limit
-            hour_bucket = self.hour_buckets[client_id][tier]
-            if not hour_bucket.consume(self.limits[tier]["tokens_per_request"]):
-                raise RateLimitError(
-                    "Rate limit exceeded: Too many requests per hour",
-                    {
-                        "limit": self.limits[tier]["requests_per_hour"],
-                        "period": "hour",
-                        "tier": tier
-                    }
-                )
-            
+            self.check_and_get_quota(client_id, tier)
             return True
             
         except RateLimitError:
@@ -144,6 +146,52 @@ class RateLimiter:
             logger.error(f"Error checking rate limit: {str(e)}")
             return True  # Allow request on error to prevent blocking service
     
+    def check_and_get_quota(self, client_id: str, tier: str = "free", cost: int = 1) -> Tuple[int, int]:
+        """Consume requests from both buckets and return the remaining quota.
+        
+        Does the work of check_rate_limit and get_remaining_quota in a single
+        pass, with one bucket lookup and one clock read.
+        
+        Args:
+            client_id (str): The client identifier
+            tier (str): The client's service tier
+            cost (int): Number of requests to consume
+            
+        Returns:
+            Tuple[int, int]: Requests remaining this minute and this hour
+            
+        Raises:
+            RateLimitError: If rate limit is exceeded
+        """
+        minute_bucket, hour_bucket = self._get_or_create_buckets(client_id, tier)
+        limits = self.limits[tier]
+        tokens = limits["tokens_per_request"] * cost
+        now = time.monotonic()
+        
+        # Check minute limit
+        if not minute_bucket.consume(tokens, now):
+            raise RateLimitError(
+                "Rate limit exceeded: Too many requests per minute",
+                {
+                    "limit": limits["requests_per_minute"],
+                    "period": "minute",
+                    "tier": tier
+                }
+            )
+        
+        # Check hour limit
+        if not hour_bucket.consume(tokens, now):
+            raise RateLimitError(
+                "Rate limit exceeded: Too many requests per hour",
+                {
+                    "limit": limits["requests_per_hour"],
+                    "period": "hour",
+                    "tier": tier
+                }
+            )
+        
+        return int(minute_bucket.tokens), int(hour_bucket.tokens)
+    
     def get_remaining_quota(self, client_id: str, tier: str = "free") -> Dict[str, int]:
         """Get remaining quota for a client.
         
@@ -154,15 +202,16 @@ class RateLimiter:
         Returns:
             Dict[str, int]: Remaining quota for different time periods
         """
-        self._get_or_create_buckets(client_id, tier)
+        minute_bucket, hour_bucket = self._get_or_create_buckets(client_id, tier)
         
         # Refill buckets to get current token counts
-        self.minute_buckets[client_id][tier]._refill()
-        self.hour_buckets[client_id][tier]._refill()
+        now = time.monotonic()
+        minute_bucket._refill(now)
+        hour_bucket._refill(now)
         
         return {
-            "requests_per_minute_remaining": int(self.minute_buckets[client_id][tier].tokens),
-            "requests_per_hour_remaining": int(self.hour_buckets[client_id][tier].tokens)
+            "requests_per_minute_remaining": int(minute_bucket.tokens),
+            "requests_per_hour_remaining": int(hour_bucket.tokens)
         }
 
 # Global rate limiter instance
@@ -1,8 +1,13 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from .core.config import get_settings
 from .core.middleware import RateLimitMiddleware
-from .agents.routes import router as agents_router
+from .core.http import warm_gemini_channel
+from .agents.routes import router as agents_router, create_agents
+from .agents.batcher import batcher
+import asyncio
 import logging
 
 # Configure logging
@@ -12,6 +17,30 @@ logger = logging.getLogger(__name__)
 # Initialize settings
 settings = get_settings()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create per-worker resources on startup and release them on shutdown.
+    
+    Args:
+        app (FastAPI): The application being served
+    """
+    logger.info("Starting ChromaPages AI Customer Service API")
+    logger.info(f"Environment: {settings.APP_ENV}")
+    logger.info(f"Debug mode: {settings.DEBUG}")
+    
+    try:
+        # Build the agents off the event loop while the Gemini connection warms up
+        startup = [asyncio.to_thread(create_agents)]
+        if settings.GEMINI_WARM_CONNECTION:
+            startup.append(warm_gemini_channel())
+        app.state.agents, *_ = await asyncio.gather(*startup)
+        
+        yield
+        
+    finally:
+        logger.info("Shutting down ChromaPages AI Customer Service API")
+        await batcher.close()
+
 # Create FastAPI app
 app = FastAPI(
     title=settings.APP_NAME,
@@ -32,7 +61,9 @@ app = FastAPI(
     - X-RateLimit-Remaining-Minute: Remaining requests for the current minute
     - X-RateLimit-Limit-Hour: Maximum requests per hour
     - X-RateLimit-Remaining-Hour: Remaining requests for the current hour
-    """
+    """,
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -68,18 +99,6 @@ async def health_check():
         "version": settings.APP_VERSION
     }
 
-@app.on_event("startup")
-async def startup_event():
-    """Startup event handler."""
-    logger.info("Starting ChromaPages AI Customer Service API")
-    logger.info(f"Environment: {settings.APP_ENV}")
-    logger.info(f"Debug mode: {settings.DEBUG}")
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Shutdown event handler."""
-    logger.info("Shutting down ChromaPages AI Customer Service API")
-
 # Import and include routers here as they are developed
 # Example:
 # from .agents.routes import router as agents_router
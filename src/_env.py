@@ -0,0 +1,20 @@
+"""
+Environment loading for the AI Customer Service System
+"""
+
+import os
+from functools import lru_cache
+
+@lru_cache(maxsize=1)
+def load_env() -> None:
+    """
+    Load the .env file into the environment, parsing it at most once per process
+
+    Set SKIP_DOTENV when the environment is provided by the deployment.
+    """
+    if os.getenv("SKIP_DOTENV"):
+        return
+
+    from dotenv import load_dotenv
+
+    load_dotenv()
@@ -3,30 +3,58 @@ Configuration module for the AI Customer Service System
 """
 
 import os
-from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
+from functools import lru_cache
+from types import MappingProxyType
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.messages import SystemMessage
 
+from ._env import load_env
+
 # Load environment variables
-load_dotenv()
+load_env()
 
 # API Keys
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 if not GOOGLE_API_KEY:
     raise ValueError("GOOGLE_API_KEY environment variable is not set")
 
+# Gemini model instances, shared per (model name, temperature)
+_LLMS = {}
+
+# Gemini 1.0 models reject native system instructions, so for them the system
+# prompt is merged into the first human turn instead
+_NO_SYSTEM_INSTRUCTION_MODELS = frozenset({"gemini-pro", "gemini-1.0-pro"})
+
 # Initialize the Gemini model
 def get_llm(model_name: str = "gemini-pro", temperature: float = 0.7):
     """
-    Get a configured instance of the Gemini model
+    Get a configured instance of the Gemini model, shared per model and temperature
+
+    The Gemini SDK is imported on first use so it does not slow down startup.
+    """
+    llm = _LLMS.get((model_name, temperature))
+    if llm is None:
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
+        llm = _LLMS[(model_name, temperature)] = ChatGoogleGenerativeAI(
+            model=model_name,
+            temperature=temperature,
+            google_api_key=GOOGLE_API_KEY,
+            convert_system_message_to_human=model_name in _NO_SYSTEM_INSTRUCTION_MODELS,
+        )
+    return llm
+
+async def close_llms():
+    """
+    Close the shared Gemini model clients and their connections
     """
-    return ChatGoogleGenerativeAI(
-        model=model_name,
-        temperature=temperature,
-        convert_system_message_to_human=True,
-        google_api_key=GOOGLE_API_KEY,
-    )
+    llms = list(_LLMS.values())
+    _LLMS.clear()
+    for llm in llms:
+        # Only newer langchain_google_genai releases own a closable client
+        aclose = getattr(llm, "aclose", None)
+        if aclose is not None:
+            await aclose()
 
 # Base system message for customer service
 BASE_SYSTEM_MESSAGE = """You are a helpful and professional customer service AI assistant. 
@@ -39,6 +67,7 @@ Your responses should be:
 Always maintain a helpful and positive tone while staying focused on resolving the customer's needs."""
 
 # Create a base chat prompt template
+@lru_cache(maxsize=1)
 def get_base_chat_prompt():
     """
     Get the base chat prompt template with system message and chat history
@@ -55,10 +84,10 @@ HUMAN_PREFIX = "Customer"
 AI_PREFIX = "Assistant"
 
 # Database configuration
-DB_CONFIG = {
+DB_CONFIG = MappingProxyType({
     "host": os.getenv("DB_HOST", "localhost"),
     "port": int(os.getenv("DB_PORT", 5432)),
     "database": os.getenv("DB_NAME", "customer_service_db"),
     "user": os.getenv("DB_USER", "postgres"),
     "password": os.getenv("DB_PASSWORD"),
-} 
\ No newline at end of file
+}) 
\ No newline at end of file
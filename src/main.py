@@ -1,20 +1,47 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
+from typing import Any, Dict, Optional
+import json
 import os
-from dotenv import load_dotenv
+from contextlib import asynccontextmanager
+from functools import lru_cache
 
-from .utils import create_chat_pipeline, create_chat_memory, create_structured_output
-from .config import get_llm
+from .utils import create_chat_pipeline, create_chat_memory, is_small_talk
+from .config import close_llms
+from ._env import load_env
 
 # Load environment variables
-load_dotenv()
+load_env()
+
+# Create the chat memory on first use
+@lru_cache(maxsize=1)
+def get_chat_memory():
+    return create_chat_memory()
+
+# Create the chat pipeline on first use, so the model is only loaded once
+# a chat request arrives
+@lru_cache(maxsize=1)
+def get_chat_pipeline():
+    return create_chat_pipeline(get_chat_memory())
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Drop the pipeline and memory built on the shared model clients, then
+    # close the clients and their connections
+    get_chat_pipeline.cache_clear()
+    get_chat_memory.cache_clear()
+    await close_llms()
 
 # Create FastAPI app
 app = FastAPI(
     title="AI Customer Service System",
     description="A Multi-Agent System for customer service using LangChain and Google's Gemini",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -26,15 +53,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Create a chat memory instance
-chat_memory = create_chat_memory()
-
-# Create a chat pipeline
-chat_pipeline = create_chat_pipeline(chat_memory)
-
 class ChatInput(BaseModel):
     message: str
 
+class ChatOutput(BaseModel):
+    message: str
+    status: str = "success"
+    metadata: Optional[Dict[str, Any]] = None
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
@@ -50,14 +76,22 @@ async def root():
     }
 
 # Chat endpoint
-@app.post("/chat")
+@app.post("/chat", response_model=ChatOutput, response_model_exclude_none=True)
 async def chat(chat_input: ChatInput):
     try:
         # Process the message through the chat pipeline
-        response = chat_pipeline.invoke({"input": chat_input.message})
+        response = await get_chat_pipeline().ainvoke({"input": chat_input.message})
+        
+        # Record the exchange so the memory can summarize older turns;
+        # small talk adds nothing worth remembering
+        if not is_small_talk(chat_input.message):
+            await get_chat_memory().asave_context(
+                {"input": chat_input.message},
+                {"output": response}
+            )
         
         # Create structured response
-        return create_structured_output(
+        return ChatOutput(
             message=response,
             metadata={
                 "model": "gemini-pro",
@@ -70,6 +104,29 @@ async def chat(chat_input: ChatInput):
             detail=f"An error occurred while processing your request: {str(e)}"
         )
 
+# Streaming chat endpoint, sending the reply as server-sent events
+@app.post("/chat/stream")
+async def chat_stream(chat_input: ChatInput):
+    async def events():
+        chunks = []
+        try:
+            async for chunk in get_chat_pipeline().astream({"input": chat_input.message}):
+                chunks.append(chunk)
+                yield f"data: {json.dumps({'delta': chunk})}\n\n"
+                
+            # Record the full reply once the stream has finished
+            if not is_small_talk(chat_input.message):
+                await get_chat_memory().asave_context(
+                    {"input": chat_input.message},
+                    {"output": "".join(chunks)}
+                )
+        except Exception as e:
+            # Headers are already sent, so report the failure as an event
+            error = f"An error occurred while processing your request: {str(e)}"
+            yield f"data: {json.dumps({'error': error})}\n\n"
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=int(os.getenv("APP_PORT", 8000))) 
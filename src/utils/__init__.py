@@ -2,10 +2,24 @@
 Utility modules for the AI Customer Service System
 """
 
-from .langchain_utils import (
-    create_chat_memory,
-    create_conversation_chain,
-    create_chat_pipeline,
-    format_chat_history,
-    create_structured_output,
-) 
\ No newline at end of file
+import importlib
+
+# Exported names and the modules defining them, imported on first access so
+# the LangChain modules only load when a utility is actually used
+_LAZY = {
+    "create_chat_memory": ".langchain_utils",
+    "create_conversation_chain": ".langchain_utils",
+    "create_chat_pipeline": ".langchain_utils",
+    "format_chat_history": ".langchain_utils",
+    "is_small_talk": ".langchain_utils",
+    "create_structured_output": ".langchain_utils",
+}
+
+__all__ = list(_LAZY)
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name], __package__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -2,26 +2,60 @@
 Utility functions for LangChain operations
 """
 
-from typing import List, Dict, Any
+import re
+from typing import List, Dict, Any, Optional
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.runnables import RunnablePassthrough
-from langchain.memory import ConversationBufferMemory
+from langchain.memory import ConversationSummaryBufferMemory
 from langchain.chains import ConversationChain
 from ..config import get_llm, get_base_chat_prompt, MEMORY_KEY, HUMAN_PREFIX, AI_PREFIX
 
-def create_chat_memory() -> ConversationBufferMemory:
+# Token budget for verbatim history; older turns are folded into a summary
+SUMMARY_MAX_TOKEN_LIMIT = 512
+
+class CachedSummaryBufferMemory(ConversationSummaryBufferMemory):
+    """
+    Summary buffer memory that reuses its loaded variables until the next write
     """
-    Create a conversation memory instance
+
+    cached_memory_variables: Optional[Dict[str, Any]] = None
+
+    def load_memory_variables(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        if self.cached_memory_variables is None:
+            self.cached_memory_variables = super().load_memory_variables(inputs)
+        return self.cached_memory_variables
+
+    def save_context(self, inputs: Dict[str, Any], outputs: Dict[str, str]) -> None:
+        super().save_context(inputs, outputs)
+        self.cached_memory_variables = None
+
+    async def asave_context(self, inputs: Dict[str, Any], outputs: Dict[str, str]) -> None:
+        await super().asave_context(inputs, outputs)
+        self.cached_memory_variables = None
+
+    def clear(self) -> None:
+        super().clear()
+        self.cached_memory_variables = None
+
+    async def aclear(self) -> None:
+        await super().aclear()
+        self.cached_memory_variables = None
+
+def create_chat_memory() -> CachedSummaryBufferMemory:
     """
-    return ConversationBufferMemory(
+    Create a conversation memory instance that summarizes older turns
+    """
+    return CachedSummaryBufferMemory(
+        llm=get_llm(model_name="gemini-pro", temperature=0.0),
+        max_token_limit=SUMMARY_MAX_TOKEN_LIMIT,
         memory_key=MEMORY_KEY,
         return_messages=True,
         human_prefix=HUMAN_PREFIX,
         ai_prefix=AI_PREFIX,
     )
 
-def create_conversation_chain(memory: ConversationBufferMemory = None) -> ConversationChain:
+def create_conversation_chain(memory: ConversationSummaryBufferMemory = None) -> ConversationChain:
     """
     Create a conversation chain with memory
     """
@@ -34,7 +68,16 @@ def create_conversation_chain(memory: ConversationBufferMemory = None) -> Conver
         verbose=True
     )
 
-def create_chat_pipeline(memory: ConversationBufferMemory = None):
+# Greetings and acknowledgements that need no chat history to answer
+SMALL_TALK_PATTERN = re.compile(r"(?i)\s*(hi|hello|thanks|ok|bye)[.!]?\s*")
+
+def is_small_talk(message: str) -> bool:
+    """
+    Check whether a message is a greeting or acknowledgement
+    """
+    return SMALL_TALK_PATTERN.fullmatch(message) is not None
+
+def create_chat_pipeline(memory: ConversationSummaryBufferMemory = None):
     """
     Create a chat pipeline with memory and prompt template
     """
@@ -46,41 +89,36 @@ def create_chat_pipeline(memory: ConversationBufferMemory = None):
     
     return (
         RunnablePassthrough.assign(
-            chat_history=lambda x: memory.load_memory_variables({})[MEMORY_KEY]
+            chat_history=lambda x: (
+                [] if is_small_talk(x["input"])
+                else memory.load_memory_variables({})[MEMORY_KEY]
+            )
         )
         | prompt
         | model
         | StrOutputParser()
     )
 
+# Role reported for each chat message type
+CHAT_ROLES = {
+    HumanMessage: "user",
+    AIMessage: "assistant",
+}
+
 def format_chat_history(messages: List[BaseMessage]) -> List[Dict[str, Any]]:
     """
     Format chat history messages into a structured format
     """
-    formatted_messages = []
-    for message in messages:
-        if isinstance(message, HumanMessage):
-            formatted_messages.append({
-                "role": "user",
-                "content": message.content
-            })
-        elif isinstance(message, AIMessage):
-            formatted_messages.append({
-                "role": "assistant",
-                "content": message.content
-            })
-    return formatted_messages
+    return [
+        {"role": CHAT_ROLES[type(message)], "content": message.content}
+        for message in messages
+        if type(message) in CHAT_ROLES
+    ]
 
 def create_structured_output(message: str, metadata: Dict[str, Any] = None) -> Dict[str, Any]:
     """
     Create a structured output format for responses
     """
-    output = {
-        "message": message,
-        "status": "success",
-    }
-    
     if metadata:
-        output["metadata"] = metadata
-    
-    return output 
\ No newline at end of file
+        return {"message": message, "status": "success", "metadata": metadata}
+    return {"message": message, "status": "success"} 
\ No newline at end of file
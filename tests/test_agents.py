@@ -0,0 +1,176 @@
+import asyncio
+import numpy as np
+import pytest
+from types import SimpleNamespace
+from google.api_core import exceptions as google_exceptions
+from google.generativeai.types import BlockedPromptException
+from app.agents import base, semantic_cache
+from app.agents.base import BaseAgent
+from app.core.config import get_settings
+
+class EchoAgent(BaseAgent):
+    """Agent used to exercise BaseAgent without a Gemini model."""
+
+    def __init__(self):
+        super().__init__("Echo", "a test agent")
+
+class FakeModel:
+    """Stand-in for batcher.submit that records prompts and replays outcomes.
+
+    Each outcome is an exception to raise or the text to respond with; once
+    they run out, the prompt's message is echoed back.
+    """
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.messages = []
+
+    async def submit(self, model, contents, stream=False):
+        message = contents[-1]["parts"][-1].removeprefix("User message: ")
+        self.messages.append(message)
+        outcome = self.outcomes.pop(0) if self.outcomes else f"reply to {message}"
+        if isinstance(outcome, Exception):
+            raise outcome
+        return SimpleNamespace(
+            text=outcome,
+            prompt_feedback=SimpleNamespace(block_reason=None)
+        )
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    """Route Gemini requests to a FakeModel and start with empty caches."""
+    settings = get_settings()
+    monkeypatch.setattr(settings, "SEMANTIC_CACHE_ENABLED", False)
+    monkeypatch.setattr(settings, "SEMANTIC_CACHE_PERSIST_ENABLED", False)
+    monkeypatch.setattr(BaseAgent, "_response_cache", type(BaseAgent._response_cache)())
+    model = FakeModel()
+    monkeypatch.setattr(base.batcher, "submit", model.submit)
+    return model
+
+# Fake embeddings by message; the first two are paraphrases of each other
+_EMBEDDINGS = {
+    "How do I reset my password?": [1.0, 0.0, 0.0],
+    "how can I reset my password": [0.99, 0.14, 0.0],
+    "What are your prices?": [0.0, 0.0, 1.0],
+    "Yes, please": [0.0, 1.0, 0.0],
+}
+
+def _fake_embed(text):
+    """Embed the message on the last line of the text, ignoring its context."""
+    vector = np.asarray(_EMBEDDINGS[text.rsplit("\n", 1)[-1]], dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+@pytest.fixture
+def semantic(fake_model, monkeypatch):
+    """Enable the semantic cache with fake embeddings."""
+    monkeypatch.setattr(get_settings(), "SEMANTIC_CACHE_ENABLED", True)
+    monkeypatch.setattr(semantic_cache, "embed", _fake_embed)
+    return fake_model
+
+def test_response_cache_hit(fake_model):
+    """Test a repeated message is answered from the cache without the model."""
+    first = asyncio.run(EchoAgent().process_message("What are your prices?"))
+    second = asyncio.run(EchoAgent().process_message("What are your prices?"))
+
+    assert first == second == "reply to What are your prices?"
+    assert fake_model.messages == ["What are your prices?"]
+
+    # Other messages still go to the model
+    asyncio.run(EchoAgent().process_message("Do you offer hosting?"))
+    assert fake_model.messages == ["What are your prices?", "Do you offer hosting?"]
+
+def test_response_cache_disabled(fake_model):
+    """Test an agent with caching disabled always calls the model."""
+    agent = EchoAgent()
+    agent.cache_enabled = False
+    for _ in range(2):
+        agent.clear_conversation_history()
+        asyncio.run(agent.process_message("What are your prices?"))
+
+    assert fake_model.messages == ["What are your prices?"] * 2
+
+def test_semantic_cache_hit(semantic):
+    """Test a paraphrased message is answered from the semantic cache."""
+    agent = EchoAgent()
+    first = asyncio.run(agent.process_message("How do I reset my password?"))
+    
+    agent.clear_conversation_history()
+    second = asyncio.run(agent.process_message("how can I reset my password"))
+    assert second == first
+    assert semantic.messages == ["How do I reset my password?"]
+    
+    # A message that is not similar misses
+    agent.clear_conversation_history()
+    asyncio.run(agent.process_message("What are your prices?"))
+    assert semantic.messages == ["How do I reset my password?", "What are your prices?"]
+
+def test_semantic_cache_long_history(semantic):
+    """Test the semantic cache still applies once an agent has a long history."""
+    agent = EchoAgent()
+    for _ in range(3):
+        for message in ("What are your prices?", "Yes, please"):
+            asyncio.run(agent.process_message(message))
+    
+    # Both questions follow the same preceding turns
+    asyncio.run(agent.process_message("What are your prices?"))
+    first = asyncio.run(agent.process_message("How do I reset my password?"))
+    asyncio.run(agent.process_message("What are your prices?"))
+    second = asyncio.run(agent.process_message("how can I reset my password"))
+    
+    assert len(agent.conversation_history) > 6
+    assert second == first
+    assert "how can I reset my password" not in semantic.messages
+
+def test_response_cache_context(semantic):
+    """Test a cached reply is only reused after the same preceding turns."""
+    agent = EchoAgent()
+    
+    def converse(*messages):
+        agent.clear_conversation_history()
+        return [asyncio.run(agent.process_message(message)) for message in messages]
+    
+    first = converse("How do I reset my password?", "Yes, please")
+    assert len(semantic.messages) == 2
+    
+    # The same reply in another conversation misses both caches
+    converse("What are your prices?", "Yes, please")
+    assert semantic.messages[2:] == ["What are your prices?", "Yes, please"]
+    
+    # The same conversation again is answered from the cache
+    assert converse("How do I reset my password?", "Yes, please") == first
+    assert len(semantic.messages) == 4
+
+@pytest.fixture
+def retry_delays(monkeypatch):
+    """Record the backoff ceilings of retries, which then wait no time."""
+    delays = []
+    monkeypatch.setattr(base.random, "uniform", lambda low, high: delays.append(high) or 0.0)
+    return delays
+
+def test_safety_error_not_retried(fake_model, retry_delays):
+    """Test a blocked prompt is reported without retrying."""
+    fake_model.outcomes = [BlockedPromptException("Content blocked"), "too late"]
+    response = asyncio.run(EchoAgent().process_message("Something unsafe"))
+    
+    assert response == base._SAFETY_ERROR_RESPONSE
+    assert fake_model.messages == ["Something unsafe"]
+    assert retry_delays == []
+
+def test_quota_error_retried(fake_model, retry_delays):
+    """Test quota errors are retried with backoff up to three attempts."""
+    fake_model.outcomes = [google_exceptions.TooManyRequests("Quota exceeded")] * 2
+    response = asyncio.run(EchoAgent().process_message("What are your prices?"))
+    
+    assert response == "reply to What are your prices?"
+    assert len(fake_model.messages) == 3
+    assert retry_delays == [1, 2]
+    
+    # Give up after the third attempt
+    fake_model.outcomes = [google_exceptions.TooManyRequests("Quota exceeded")] * 4
+    fake_model.messages.clear()
+    retry_delays.clear()
+    response = asyncio.run(EchoAgent().process_message("Do you offer hosting?"))
+    
+    assert response == base._QUOTA_ERROR_RESPONSE
+    assert len(fake_model.messages) == 3
+    assert retry_delays == [1, 2]
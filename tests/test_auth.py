@@ -1,13 +1,17 @@
+import hashlib
 import pytest
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, UTC
+from jose import jwt
 from app.core.auth import (
     create_access_token,
     verify_token,
     verify_api_key,
     create_api_key_token,
     Token,
-    TokenData
+    TokenData,
+    _api_keys
 )
+from app.core.config import get_settings
 from app.core.exceptions import AuthenticationError
 
 def test_create_access_token():
@@ -55,6 +59,29 @@ def test_verify_token():
     with pytest.raises(AuthenticationError):
         verify_token(expired_token)
 
+def test_verify_token_cached():
+    """Test repeated verification of the same token."""
+    data = {
+        "api_key": "test_key",
+        "tier": "pro",
+        "scope": "agents:*"
+    }
+    token = create_access_token(data)
+    
+    first = verify_token(token)
+    second = verify_token(token)
+    assert second == first
+    assert second.tier == "pro"
+    
+    # A token signed with another key is still rejected
+    forged = jwt.encode(
+        {**data, "exp": datetime.now(UTC) + timedelta(minutes=5)},
+        "another-secret",
+        algorithm="HS256"
+    )
+    with pytest.raises(AuthenticationError):
+        verify_token(forged)
+
 def test_verify_api_key():
     """Test API key verification."""
     # Test valid API keys
@@ -74,6 +101,44 @@ def test_verify_api_key():
     with pytest.raises(AuthenticationError):
         verify_api_key("invalid_key")
 
+def test_verify_api_key_production():
+    """Test that test API keys are rejected in production."""
+    settings = get_settings()
+    app_env = settings.APP_ENV
+    settings.APP_ENV = "production"
+    _api_keys.cache_clear()
+    try:
+        with pytest.raises(AuthenticationError):
+            verify_api_key("test_free_key")
+    finally:
+        settings.APP_ENV = app_env
+        _api_keys.cache_clear()
+        
+    assert verify_api_key("test_free_key")["tier"] == "free"
+
+def test_verify_api_key_configured_production():
+    """Test that configured API keys are accepted in production."""
+    settings = get_settings()
+    app_env = settings.APP_ENV
+    api_key_hashes = settings.API_KEY_HASHES
+    settings.APP_ENV = "production"
+    settings.API_KEY_HASHES = {hashlib.sha256(b"prod_pro_key").hexdigest(): "pro"}
+    _api_keys.cache_clear()
+    try:
+        pro_data = verify_api_key("prod_pro_key")
+        assert pro_data["tier"] == "pro"
+        assert pro_data["scope"] == "agents:*"
+        
+        with pytest.raises(AuthenticationError):
+            verify_api_key("test_pro_key")
+    finally:
+        settings.APP_ENV = app_env
+        settings.API_KEY_HASHES = api_key_hashes
+        _api_keys.cache_clear()
+    
+    with pytest.raises(AuthenticationError):
+        verify_api_key("prod_pro_key")
+
 def test_create_api_key_token():
     """Test API key token creation."""
     # Test with valid API keys
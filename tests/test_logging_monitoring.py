@@ -1,4 +1,5 @@
 import pytest
+import gzip
 import json
 import logging
 import time
@@ -169,17 +170,17 @@ def test_metrics_file_writing():
     collector._write_metrics_to_disk()
     
     # Check metrics directory
-    metrics_files = list(Path("metrics").glob("metrics_*.json"))
+    metrics_files = list(Path("metrics").glob("metrics_*.jsonl.gz"))
     assert len(metrics_files) > 0
     
     # Read latest metrics file
     latest_file = max(metrics_files, key=lambda p: p.stat().st_mtime)
-    with open(latest_file) as f:
-        metrics_data = json.load(f)
+    with gzip.open(latest_file) as f:
+        records = [json.loads(line) for line in f]
     
-    assert "test_metric" in metrics_data
-    assert len(metrics_data["test_metric"]) > 0
-    assert metrics_data["test_metric"][0]["value"] == 42
+    metrics_data = [r for r in records if r["metric"] == "test_metric"]
+    assert len(metrics_data) > 0
+    assert metrics_data[-1]["value"] == 42
 
 def test_metrics_filtering():
     """Test metrics filtering by time and tags."""
@@ -213,3 +214,27 @@ def test_metrics_filtering():
     )
     assert len(prod_metrics) == 1
     assert prod_metrics[0]["value"] == 1 
+
+def test_metrics_clock_step_back(monkeypatch):
+    """Test time filtering when the wall clock steps back between records."""
+    collector = MetricsCollector()
+    
+    clock = iter([1000.0, 2000.0, 1500.0])
+    monkeypatch.setattr("app.core.monitoring.time.time", lambda: next(clock))
+    for value in (1, 2, 3):
+        collector.record_metric("test_metric", value)
+    monkeypatch.undo()
+    
+    # The record after the step back is kept in order, at the previous time
+    metrics = collector.get_metrics(
+        "test_metric",
+        start_time=datetime.fromtimestamp(1800, UTC)
+    )
+    assert [m["value"] for m in metrics] == [2, 3]
+    assert metrics[1]["timestamp"] == metrics[0]["timestamp"]
+    
+    metrics = collector.get_metrics(
+        "test_metric",
+        end_time=datetime.fromtimestamp(1500, UTC)
+    )
+    assert [m["value"] for m in metrics] == [1]
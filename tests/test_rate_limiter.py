@@ -80,4 +80,30 @@ def test_rate_limiter_refill():
     
     # Check refilled tokens
     final_quota = limiter.get_remaining_quota(client_id, "free")
-    assert final_quota["requests_per_minute_remaining"] >= initial_quota["requests_per_minute_remaining"] 
\ No newline at end of file
+    assert final_quota["requests_per_minute_remaining"] >= initial_quota["requests_per_minute_remaining"]
+
+def test_check_and_get_quota(monkeypatch):
+    """Test quota values and the minute limit of check_and_get_quota."""
+    # Freeze the clock so no tokens are refilled between requests
+    monkeypatch.setattr("app.core.rate_limiter.time.monotonic", lambda: 1000.0)
+    limiter = RateLimiter()
+    client_id = "test_client"
+    
+    # Each request returns the quota left after consuming it
+    for used in range(1, 21):
+        assert limiter.check_and_get_quota(client_id, "free") == (20 - used, 100 - used)
+    
+    # The 21st request exceeds the free tier's minute limit
+    with pytest.raises(RateLimitError) as exc_info:
+        limiter.check_and_get_quota(client_id, "free")
+    assert "Too many requests per minute" in str(exc_info.value)
+    assert exc_info.value.details == {"limit": 20, "period": "minute", "tier": "free"}
+    
+    # A rejected request does not use up the hour quota
+    assert limiter.get_remaining_quota(client_id, "free") == {
+        "requests_per_minute_remaining": 0,
+        "requests_per_hour_remaining": 80
+    }
+    
+    # Other tiers keep their own buckets
+    assert limiter.check_and_get_quota(client_id, "pro") == (59, 999)
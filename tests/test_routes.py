@@ -0,0 +1,120 @@
+import asyncio
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.agents import routes
+from app.agents.routes import router, get_agents, _MAX_BATCH_SIZE
+from app.core import middleware
+from app.core.exceptions import ContentBlockedError
+from app.core.middleware import RateLimitMiddleware
+from app.core.rate_limiter import RateLimiter
+
+BATCH_URL = "/api/agents/chat/batch"
+
+class StubAgent:
+    """Agent answering without a model; message content controls its behavior."""
+
+    async def process_message(self, message: str) -> str:
+        if message == "blocked":
+            raise ContentBlockedError("Message blocked")
+        if message == "crash":
+            raise RuntimeError("Agent crashed")
+        # Later messages finish first, so ordering follows the request
+        await asyncio.sleep(0.05 / int(message))
+        return f"reply {message}"
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(router)
+    agents = {"content": StubAgent(), "product": StubAgent()}
+    app.dependency_overrides[get_agents] = lambda: agents
+    with TestClient(app) as client:
+        yield client
+
+@pytest.fixture
+def limited_client(monkeypatch):
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware)
+    app.include_router(router)
+    agents = {"content": StubAgent(), "product": StubAgent()}
+    app.dependency_overrides[get_agents] = lambda: agents
+    limiter = RateLimiter()
+    monkeypatch.setattr(middleware, "rate_limiter", limiter)
+    monkeypatch.setattr(routes, "rate_limiter", limiter)
+    with TestClient(app) as client:
+        yield client
+
+def test_chat_batch_order(client):
+    """Test batch responses are returned in message order."""
+    messages = [
+        {"content": str(i), "agent_type": "content" if i % 2 else "product"}
+        for i in range(1, 6)
+    ]
+    response = client.post(BATCH_URL, json=messages)
+    assert response.status_code == 200
+
+    results = response.json()
+    assert [r["response"] for r in results] == [f"reply {i}" for i in range(1, 6)]
+    assert [r["agent_type"] for r in results] == [m["agent_type"] for m in messages]
+    assert all(r["error"] is None for r in results)
+
+def test_chat_batch_errors(client):
+    """Test a failing message gets its own error body without affecting the others."""
+    messages = [
+        {"content": "1", "agent_type": "content"},
+        {"content": "blocked", "agent_type": "content"},
+        {"content": "crash", "agent_type": "product"},
+        {"content": "2", "agent_type": "unknown"},
+        {"content": "3", "agent_type": "product"}
+    ]
+    response = client.post(BATCH_URL, json=messages)
+    assert response.status_code == 200
+    ok, blocked, crashed, invalid, last = response.json()
+
+    assert ok["response"] == "reply 1"
+    assert ok["error"] is None
+    assert last["response"] == "reply 3"
+    assert last["error"] is None
+
+    assert blocked["response"] == "Message blocked"
+    assert blocked["error"]["error_type"] == "CONTENT_BLOCKED"
+    assert blocked["error"]["status_code"] == 400
+    assert blocked["should_route"] is False
+
+    assert crashed["response"] == "An unexpected error occurred. Please try again later."
+    assert crashed["error"]["error_type"] == "INTERNAL_SERVER_ERROR"
+    assert crashed["error"]["status_code"] == 500
+
+    assert invalid["agent_type"] == "unknown"
+    assert invalid["error"]["error_type"] == "VALIDATION_FAILED"
+
+def test_chat_batch_size_limits(client):
+    """Test batches must hold between 1 and _MAX_BATCH_SIZE messages."""
+    assert client.post(BATCH_URL, json=[]).status_code == 422
+
+    messages = [{"content": "1", "agent_type": "content"}] * (_MAX_BATCH_SIZE + 1)
+    assert client.post(BATCH_URL, json=messages).status_code == 422
+
+    response = client.post(BATCH_URL, json=messages[:_MAX_BATCH_SIZE])
+    assert response.status_code == 200
+    assert len(response.json()) == _MAX_BATCH_SIZE
+
+def test_chat_batch_rate_limit(limited_client):
+    """Test each batch message counts against the rate limits."""
+    # A batch larger than the free tier's minute limit is rejected
+    messages = [{"content": "1", "agent_type": "content"}] * _MAX_BATCH_SIZE
+    response = limited_client.post(BATCH_URL, json=messages)
+    assert response.status_code == 429
+    assert response.json()["details"] == {"limit": 20, "period": "minute", "tier": "free"}
+    
+    # The rejected batch was charged as one request, leaving 19 of 20;
+    # a batch of 19 uses up the rest of the minute quota
+    response = limited_client.post(BATCH_URL, json=messages[:19])
+    assert response.status_code == 200
+    assert len(response.json()) == 19
+    assert response.headers["X-RateLimit-Remaining-Minute"] == "0"
+    assert response.headers["X-RateLimit-Remaining-Hour"] == "80"
+    
+    response = limited_client.post(BATCH_URL, json=messages[:1])
+    assert response.status_code == 429